@@ -7,28 +7,35 @@ Quickstart: https://github.com/google-gemini/cookbook/blob/main/quickstarts/Get_
 To install the dependencies for this script, run:
 
 ```
-pip install google-genai opencv-python pyaudio pillow mss
+pip install google-genai opencv-python pyaudio pillow mss numpy
 ```
 """
 
 import os
 import asyncio
-import base64
+import collections
 import io
+import json
+import multiprocessing
+import queue
+import threading
+import time
 import traceback
+import sys
+import wave
 
-import cv2
-import pyaudio
-import PIL.Image
-import mss
+import functools
+
+import numpy as np
 
 import argparse
 
-from google import genai
-from google.genai import types
+# cv2, PIL, mss, pyaudio and google.genai are imported where they are first
+# needed, so e.g. `--mode none` never loads the video libraries and nothing
+# touches the audio devices or builds the API client at import time.
 
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
+SAMPLE_WIDTH = 2  # 16-bit audio = 2 bytes
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
@@ -37,39 +44,879 @@ MODEL = "models/gemini-2.5-flash-native-audio-preview-12-2025"
 
 DEFAULT_MODE = "camera"
 
-client = genai.Client(
-    http_options={"api_version": "v1beta"},
-    api_key=os.environ.get("GEMINI_API_KEY"),
-)
+# Frame gating: frames whose downsampled difference from the last sent frame
+# is below the threshold are dropped before JPEG encoding.
+FRAME_DIFF_THRESHOLD = 0.02
+FRAME_MIN_INTERVAL = 0.25
+FRAME_MAX_INTERVAL = 1.0
+FRAME_KEEPALIVE_INTERVAL = 5.0
+
+# Voice activity gating on the mic uplink. Chunks are CHUNK_SIZE samples
+# (64 ms at 16 kHz), so the hangover keeps ~0.8 s of trailing silence for the
+# server to detect the end of the turn and the pre-roll keeps ~0.2 s of onset.
+# Once the hangover runs out the server is told the audio stream paused.
+VAD_ENERGY_THRESHOLD = 400
+VAD_MAX_ZERO_CROSSING_RATE = 0.35
+VAD_HANGOVER_CHUNKS = 12
+VAD_PREROLL_CHUNKS = 3
+
+# Session recorder: chunks beyond the queue size are dropped, never waited on.
+RECORDER_QUEUE_SIZE = 1024
+RECORDER_FLUSH_INTERVAL = 1.0
+
+# Session resumption: a session that stayed up for SESSION_STABLE_SECONDS is
+# resumed at once after a transient disconnect; failed connects and sessions
+# that die sooner are retried with exponential backoff, resuming the
+# server-side session from the latest handle.
+MAX_RECONNECTS = 5  # consecutive failed attempts; the total over a session is unbounded
+SESSION_STABLE_SECONDS = 5.0
+RECONNECT_BACKOFF = 0.5
+RECONNECT_BACKOFF_MAX = 8.0
+# Websocket close codes worth reconnecting on: going away, abnormal closure,
+# internal error, service restart, try again later.
+RESUMABLE_CLOSE_CODES = {1001, 1006, 1011, 1012, 1013}
+
+@functools.cache
+def get_client():
+    from google import genai
+
+    return genai.Client(
+        http_options={"api_version": "v1beta"},
+        api_key=os.environ.get("GEMINI_API_KEY"),
+    )
+
+
+@functools.cache
+def get_config(resumption_handle=None):
+    from google.genai import types
+
+    return types.LiveConnectConfig(
+        response_modalities=[
+            "AUDIO",
+        ],
+        media_resolution="MEDIA_RESOLUTION_MEDIUM",
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Zephyr")
+            )
+        ),
+        context_window_compression=types.ContextWindowCompressionConfig(
+            trigger_tokens=25600,
+            sliding_window=types.SlidingWindow(target_tokens=12800),
+        ),
+        # Always requested so the server keeps sending fresh handles; a None
+        # handle starts a new session.
+        session_resumption=types.SessionResumptionConfig(handle=resumption_handle),
+    )
+
+
+@functools.cache
+def get_pya():
+    import pyaudio
+
+    return pyaudio.PyAudio()
+
+
+class SessionGoingAway(ConnectionError):
+    """The server announced it will close the connection soon."""
+
+
+def is_transient_disconnect(exc):
+    """True if ``exc`` (or every exception in a group) is a dropped connection."""
+    if isinstance(exc, BaseExceptionGroup):
+        return all(is_transient_disconnect(e) for e in exc.exceptions)
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # Only look these up if the real client has loaded them; a stand-in
+    # session can't raise them otherwise.
+    websockets = sys.modules.get("websockets")
+    if websockets is not None and isinstance(exc, websockets.ConnectionClosed):
+        return True
+    genai_errors = sys.modules.get("google.genai.errors")
+    return (
+        genai_errors is not None
+        and isinstance(exc, genai_errors.APIError)
+        and exc.code in RESUMABLE_CLOSE_CODES
+    )
+
+
+# Returned by the frame grabbers when the gate decided not to send a frame.
+SKIPPED_FRAME = object()
+
+# Tells the session recorder's writer thread to flush and exit.
+_STOP = object()
+
+# Queued by listen_audio when the voice gate stops sending mic audio.
+AUDIO_STREAM_END = object()
+
+
+class FrameGate:
+    """Drops near-duplicate frames and adapts the capture interval.
+
+    Each candidate frame is reduced to a tiny grayscale thumbnail and compared
+    with the last frame that was sent. Fast-changing scenes shorten the
+    interval down to ``min_interval``; static scenes relax it back to
+    ``max_interval`` and only send a keepalive frame every
+    ``keepalive_interval`` seconds. A ``threshold`` of 0 sends every frame
+    at ``max_interval``.
+    """
+
+    THUMB_SIZE = (32, 24)
+
+    def __init__(
+        self,
+        threshold=FRAME_DIFF_THRESHOLD,
+        min_interval=FRAME_MIN_INTERVAL,
+        max_interval=FRAME_MAX_INTERVAL,
+        keepalive_interval=FRAME_KEEPALIVE_INTERVAL,
+    ):
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.keepalive_interval = keepalive_interval
+
+        self.interval = max_interval
+        self.sent = 0
+        self.skipped = 0
+
+        self._last_thumb = None
+        self._last_sent_at = 0.0
 
+    def _thumbnail(self, img):
+        import PIL.Image
 
-CONFIG = types.LiveConnectConfig(
-    response_modalities=[
-        "AUDIO",
-    ],
-    media_resolution="MEDIA_RESOLUTION_MEDIUM",
-    speech_config=types.SpeechConfig(
-        voice_config=types.VoiceConfig(
-            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Zephyr")
+        small = img.convert("L").resize(self.THUMB_SIZE, PIL.Image.BILINEAR)
+        return np.asarray(small, dtype=np.int16)
+
+    def admit(self, img):
+        """Return True if ``img`` should be sent. Safe to call from a worker thread."""
+        thumb = self._thumbnail(img)
+        now = time.monotonic()
+
+        if self._last_thumb is None:
+            diff = 1.0
+        else:
+            diff = float(np.abs(thumb - self._last_thumb).mean()) / 255.0
+
+        # A zero threshold disables gating entirely: every frame is sent at
+        # the fixed ``max_interval`` rate, as before the gate existed.
+        if self.threshold > 0:
+            if diff >= self.threshold * 4:
+                # Scene is changing quickly: sample more often.
+                self.interval = max(self.min_interval, self.interval / 2)
+            elif diff < self.threshold:
+                self.interval = min(self.max_interval, self.interval * 1.5)
+
+        keepalive_due = now - self._last_sent_at >= self.keepalive_interval
+        if diff < self.threshold and not keepalive_due:
+            self.skipped += 1
+            return False
+
+        self._last_thumb = thumb
+        self._last_sent_at = now
+        self.sent += 1
+        return True
+
+    def report(self):
+        total = self.sent + self.skipped
+        ratio = self.skipped / total if total else 0.0
+        return f"frames sent: {self.sent}, skipped: {self.skipped} ({ratio:.0%} skipped)"
+
+
+class VoiceActivityGate:
+    """Energy/zero-crossing voice activity detector for the mic uplink.
+
+    ``process`` takes one int16 PCM chunk and returns the chunks that should be
+    sent: nothing during silence, the buffered pre-roll plus the chunk at a
+    speech onset, and every chunk while speaking or within the hangover.
+    ``stream_paused`` is set on the first chunk held back after that, when
+    the server should be told the audio stream ended.
+    """
+
+    def __init__(
+        self,
+        energy_threshold=VAD_ENERGY_THRESHOLD,
+        max_zero_crossing_rate=VAD_MAX_ZERO_CROSSING_RATE,
+        hangover_chunks=VAD_HANGOVER_CHUNKS,
+        preroll_chunks=VAD_PREROLL_CHUNKS,
+        enabled=True,
+    ):
+        self.energy_threshold = energy_threshold
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.hangover_chunks = hangover_chunks
+        self.enabled = enabled
+
+        self.speech_chunks = 0
+        self.silence_chunks = 0
+        self.bytes_saved = 0
+        self.in_speech = False
+        self.stream_paused = False
+
+        self._preroll = collections.deque(maxlen=preroll_chunks)
+        self._hangover = 0
+        self._streaming = False
+
+    def is_speech(self, data):
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return False
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        if rms < self.energy_threshold:
+            return False
+        signs = np.signbit(samples)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / samples.size
+        # Loud broadband noise crosses zero far more often than voiced speech;
+        # very loud chunks are kept regardless so fricatives aren't clipped.
+        return zcr <= self.max_zero_crossing_rate or rms >= 2 * self.energy_threshold
+
+    def process(self, data):
+        # Classified even when disabled so speech ratio and latency tracing
+        # still see where the learner's speech ends.
+        self.in_speech = self.is_speech(data)
+        self.stream_paused = False
+        if self.in_speech:
+            self.speech_chunks += 1
+        else:
+            self.silence_chunks += 1
+
+        if not self.enabled:
+            return [data]
+
+        if self.in_speech:
+            self._hangover = self.hangover_chunks
+            self._streaming = True
+            chunks = [*self._preroll, data]
+            self._preroll.clear()
+            return chunks
+
+        if self._hangover > 0:
+            self._hangover -= 1
+            return [data]
+
+        self.stream_paused, self._streaming = self._streaming, False
+        if len(self._preroll) == self._preroll.maxlen:
+            # The oldest buffered chunk (or this one, without pre-roll) is dropped.
+            self.bytes_saved += len(self._preroll[0]) if self._preroll else len(data)
+        self._preroll.append(data)
+        return []
+
+    def report(self):
+        total = self.speech_chunks + self.silence_chunks
+        speech_ratio = self.speech_chunks / total if total else 0.0
+        return (
+            f"mic speech: {speech_ratio:.0%} of {total} chunks, "
+            f"uplink bytes saved: {self.bytes_saved}"
         )
-    ),
-    context_window_compression=types.ContextWindowCompressionConfig(
-        trigger_tokens=25600,
-        sliding_window=types.SlidingWindow(target_tokens=12800),
-    ),
-)
 
-pya = pyaudio.PyAudio()
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+class LatencyTracer:
+    """Per-turn latency trace from learner speech to tutor audio.
+
+    Monotonic timestamps are recorded for the last speech chunk captured from
+    the mic, its enqueue and its send, then for the first response chunk, the
+    first device write and turn completion. Each finished turn becomes one
+    JSON line in ``path`` (if given); ``report`` rolls the turns up into
+    p50/p95/p99 per stage.
+    """
+
+    # (name, from event, to event)
+    STAGES = [
+        ("speech_end_to_first_audio", "mic_capture", "first_write"),
+        ("capture_to_enqueue", "mic_capture", "enqueue"),
+        ("enqueue_to_send", "enqueue", "send"),
+        ("send_to_first_response", "send", "first_response"),
+        ("first_response_to_first_write", "first_response", "first_write"),
+        ("first_response_to_turn_complete", "first_response", "turn_complete"),
+    ]
+
+    def __init__(self, path=None):
+        self.path = path
+        self.turns = []
+
+        self._file = None
+        self._marks = {}
+        self._speech_msg = None
+
+    def mark(self, event, t=None, overwrite=False):
+        if overwrite or event not in self._marks:
+            self._marks[event] = time.monotonic() if t is None else t
+
+    def speech_chunk(self, msg, captured_at):
+        "Record a mic chunk classified as speech; the last one marks the end of the utterance"
+        self._speech_msg = msg
+        self.mark("mic_capture", captured_at, overwrite=True)
+
+    def enqueued(self, msg):
+        if msg is self._speech_msg:
+            self.mark("enqueue", overwrite=True)
+
+    def sent(self, msg):
+        if msg is self._speech_msg:
+            self.mark("send", overwrite=True)
+
+    def finish_turn(self):
+        self.mark("turn_complete")
+        marks, self._marks = self._marks, {}
+        self._speech_msg = None
+
+        record = {"turn": len(self.turns) + 1, "t": marks}
+        for name, start, end in self.STAGES:
+            if start in marks and end in marks and marks[end] >= marks[start]:
+                record[name] = marks[end] - marks[start]
+        self.turns.append(record)
+
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, "a", buffering=1)
+            self._file.write(json.dumps(record) + "\n")
+
+    def report(self):
+        lines = []
+        for name, _, _ in self.STAGES:
+            values = [turn[name] for turn in self.turns if name in turn]
+            if not values:
+                continue
+            p50, p95, p99 = (percentile(values, p) * 1000 for p in (50, 95, 99))
+            lines.append(
+                f"{name}: p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms"
+                f" ({len(values)} turns)"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FrameTimings:
+    """Running capture/encode time statistics for video frames."""
+
+    def __init__(self):
+        self.count = {"capture": 0, "encode": 0}
+        self.total = {"capture": 0.0, "encode": 0.0}
+        self.max = {"capture": 0.0, "encode": 0.0}
+        self.last = (None, None)
+
+    def record(self, capture_s, encode_s=None):
+        self.last = (capture_s, encode_s)
+        for stage, seconds in zip(("capture", "encode"), self.last):
+            if seconds is None:
+                continue
+            self.count[stage] += 1
+            self.total[stage] += seconds
+            self.max[stage] = max(self.max[stage], seconds)
+
+    def report(self):
+        parts = []
+        for stage in ("capture", "encode"):
+            n = self.count[stage]
+            avg_ms = self.total[stage] / n * 1000 if n else 0.0
+            parts.append(
+                f"{stage}: avg {avg_ms:.1f} ms, max {self.max[stage] * 1000:.1f} ms"
+            )
+        return "frame " + ", ".join(parts)
+
+
+def read_camera_image(cap):
+    import cv2
+    import PIL.Image
+
+    # Read the frame
+    ret, frame = cap.read()
+    # Check if the frame was read successfully
+    if not ret:
+        return None
+    # Fix: Convert BGR to RGB color space
+    # OpenCV captures in BGR but PIL expects RGB format
+    # This prevents the blue tint in the video feed
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    img = PIL.Image.fromarray(frame_rgb)  # Now using RGB frame
+    img.thumbnail([1024, 1024])
+    return img
+
+
+def grab_screen_image():
+    import mss
+    import PIL.Image
+
+    sct = mss.mss()
+    monitor = sct.monitors[0]
+
+    i = sct.grab(monitor)
+
+    # Wrap the raw RGB buffer directly instead of round-tripping through PNG.
+    return PIL.Image.frombytes("RGB", i.size, i.rgb)
+
+
+class JpegEncoder:
+    """Encodes frames into a reused buffer and returns raw JPEG bytes.
+
+    The session accepts ``bytes`` blobs directly, so frames are never base64
+    encoded on our side.
+    """
+
+    mime_type = "image/jpeg"
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+
+    def encode(self, img):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        img.save(self._buffer, format="jpeg")
+        return {"mime_type": self.mime_type, "data": self._buffer.getvalue()}
+
+
+def capture_frame(grab, frame_gate, frame_timings, encoder):
+    """Grab one image, gate it and encode it.
+
+    Returns the realtime input dict, ``SKIPPED_FRAME`` if the gate dropped it,
+    or None if the source has no more frames.
+    """
+    start = time.perf_counter()
+    img = grab()
+    if img is None:
+        return None
+    captured = time.perf_counter()
+
+    if not frame_gate.admit(img):
+        frame_timings.record(captured - start)
+        return SKIPPED_FRAME
+
+    frame = encoder.encode(img)
+    frame_timings.record(captured - start, time.perf_counter() - captured)
+    return frame
+
+
+def frame_worker(video_mode, frame_gate, conn):
+    """Entry point of the frame worker process used by ``--frame-worker``.
+
+    Captures, gates and encodes frames at the gate's pace and sends each result
+    with its timings over ``conn``. A final None marks the end of the source.
+    """
+    frame_timings = FrameTimings()
+    encoder = JpegEncoder()
+    cap = None
+    if video_mode == "camera":
+        import cv2
+
+        cap = cv2.VideoCapture(0)  # 0 represents the default camera
+        grab = lambda: read_camera_image(cap)
+    else:
+        grab = grab_screen_image
+
+    try:
+        while True:
+            start = time.perf_counter()
+            frame = capture_frame(grab, frame_gate, frame_timings, encoder)
+            if frame is None:
+                conn.send(None)
+                break
+            elapsed = time.perf_counter() - start
+
+            conn.send(
+                {
+                    "frame": None if frame is SKIPPED_FRAME else frame,
+                    "interval": frame_gate.interval,
+                    "sent": frame_gate.sent,
+                    "skipped": frame_gate.skipped,
+                    "timing": frame_timings.last,
+                }
+            )
+            time.sleep(max(0.0, frame_gate.interval - elapsed))
+    except (BrokenPipeError, EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if cap is not None:
+            cap.release()
+        conn.close()
+
+
+class PyAudioSource:
+    """Default microphone source."""
+
+    def __init__(self):
+        self.stream = None
+
+    def open(self):
+        pya = get_pya()
+        mic_info = pya.get_default_input_device_info()
+        self.stream = pya.open(
+            format=pya.get_format_from_width(SAMPLE_WIDTH),
+            channels=CHANNELS,
+            rate=SEND_SAMPLE_RATE,
+            input=True,
+            input_device_index=mic_info["index"],
+            frames_per_buffer=CHUNK_SIZE,
+        )
+
+    def read(self, num_frames):
+        if __debug__:
+            kwargs = {"exception_on_overflow": False}
+        else:
+            kwargs = {}
+        return self.stream.read(num_frames, **kwargs)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+
+
+class WavFileSource:
+    """Replays a 16 kHz mono 16-bit WAV file as if it were the microphone.
+
+    ``speed`` scales the pacing (2.0 is twice realtime, 0 disables pacing).
+    After the file ends, ``tail_silence`` seconds of silence are produced so
+    the turn can end, then ``read`` returns ``b""``. ``speech_end_at`` is the
+    monotonic time at which the last frame of the file was read.
+    """
+
+    def __init__(self, path, speed=1.0, tail_silence=2.0):
+        self.path = path
+        self.speed = speed
+        self.tail_silence = tail_silence
+        self.speech_end_at = None
+
+        self._wav = None
+        self._started_at = None
+        self._frames_read = 0
+        self._silence_left = int(tail_silence * SEND_SAMPLE_RATE)
+
+    def open(self):
+        self._wav = wave.open(self.path, "rb")
+        if (
+            self._wav.getnchannels() != CHANNELS
+            or self._wav.getsampwidth() != SAMPLE_WIDTH
+            or self._wav.getframerate() != SEND_SAMPLE_RATE
+        ):
+            self._wav.close()
+            raise ValueError(
+                f"{self.path}: expected {SEND_SAMPLE_RATE} Hz mono 16-bit PCM"
+            )
+        self._started_at = time.monotonic()
+
+    def read(self, num_frames):
+        if self.speed > 0:
+            due = self._started_at + self._frames_read / SEND_SAMPLE_RATE / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        data = self._wav.readframes(num_frames) if self.speech_end_at is None else b""
+        if data:
+            self._frames_read += len(data) // SAMPLE_WIDTH
+            if len(data) < num_frames * SAMPLE_WIDTH:
+                self.speech_end_at = time.monotonic()
+            return data
+        if self.speech_end_at is None:
+            self.speech_end_at = time.monotonic()
+
+        n = min(num_frames, self._silence_left)
+        self._silence_left -= n
+        self._frames_read += n
+        return bytes(n * SAMPLE_WIDTH)
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+
+
+class PyAudioSink:
+    """Default speaker sink."""
+
+    def __init__(self):
+        self.stream = None
+
+    def open(self):
+        pya = get_pya()
+        self.stream = pya.open(
+            format=pya.get_format_from_width(SAMPLE_WIDTH),
+            channels=CHANNELS,
+            rate=RECEIVE_SAMPLE_RATE,
+            output=True,
+        )
+
+    def write(self, data):
+        self.stream.write(data)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+
+
+class NullSink:
+    """Discards model audio but records the monotonic time of every write."""
+
+    def __init__(self):
+        self.write_times = []
+
+    def open(self):
+        pass
+
+    def write(self, data):
+        self.write_times.append((time.monotonic(), len(data)))
+
+    def first_write_after(self, t):
+        return next((w for w, _ in self.write_times if w >= t), None)
+
+    def close(self):
+        pass
+
+
+class WavFileSink(NullSink):
+    """Writes model audio to a WAV file.
+
+    Write timestamps (seconds since ``open``) go to a ``.timestamps.jsonl``
+    file next to it.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._wav = None
+        self._opened_at = None
+
+    def open(self):
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(CHANNELS)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(RECEIVE_SAMPLE_RATE)
+        self._opened_at = time.monotonic()
+
+    def write(self, data):
+        super().write(data)
+        self._wav.writeframes(data)
+
+    def close(self):
+        if self._wav is None:
+            return
+        self._wav.close()
+        with open(self.path + ".timestamps.jsonl", "w") as f:
+            for t, nbytes in self.write_times:
+                f.write(json.dumps({"t": round(t - self._opened_at, 6), "bytes": nbytes}))
+                f.write("\n")
+
+
+class SessionRecorder:
+    """Tees session audio and text to disk without slowing the realtime path.
+
+    The coroutines hand chunks over with ``put_nowait`` into one bounded queue;
+    when it is full the chunk is dropped and counted instead of waiting. A
+    background thread places audio on a shared timeline and writes it in
+    batches to ``<name>.wav`` (stereo, learner left / tutor right, at
+    RECEIVE_SAMPLE_RATE) and text to ``<name>.jsonl``. If the writer fails
+    (unwritable directory, full disk) the error is kept for ``report``.
+    """
+
+    def __init__(
+        self,
+        directory,
+        queue_size=RECORDER_QUEUE_SIZE,
+        flush_interval=RECORDER_FLUSH_INTERVAL,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        name = time.strftime("session-%Y%m%d-%H%M%S")
+        self.wav_path = os.path.join(directory, name + ".wav")
+        self.transcript_path = os.path.join(directory, name + ".jsonl")
+        self.flush_interval = flush_interval
+        self.dropped = collections.Counter()
+        self.error = None
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._started_at = None
+
+        # Writer-thread state: per-channel pending samples and the absolute
+        # sample index each channel has been filled up to.
+        self._pending = {"learner": [], "tutor": []}
+        self._cursor = {"learner": 0, "tutor": 0}
+        self._written = 0
+        self._lines = []
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _offer(self, kind, payload):
+        try:
+            self._queue.put_nowait((kind, time.monotonic(), payload))
+        except queue.Full:
+            self.dropped[kind] += 1
+
+    def learner_audio(self, data):
+        self._offer("learner", data)
+
+    def tutor_audio(self, data):
+        self._offer("tutor", data)
+
+    def transcript(self, speaker, text):
+        self._offer("text", (speaker, text))
+
+    def _place(self, channel, t, samples):
+        pos = max(int((t - self._started_at) * RECEIVE_SAMPLE_RATE), self._written)
+        gap = pos - self._cursor[channel]
+        if gap > 0:
+            self._pending[channel].append(np.zeros(gap, dtype=np.int16))
+            self._cursor[channel] = pos
+        self._pending[channel].append(samples)
+        self._cursor[channel] += len(samples)
+
+    def _handle(self, kind, t, payload):
+        if kind == "text":
+            speaker, text = payload
+            self._lines.append(
+                json.dumps(
+                    {"t": round(t - self._started_at, 3), "speaker": speaker, "text": text}
+                )
+            )
+            return
+        samples = np.frombuffer(payload, dtype=np.int16)
+        if kind == "learner":
+            # Mic audio is 16 kHz; bring it onto the 24 kHz output timeline.
+            n_out = len(samples) * RECEIVE_SAMPLE_RATE // SEND_SAMPLE_RATE
+            positions = np.arange(n_out) * (SEND_SAMPLE_RATE / RECEIVE_SAMPLE_RATE)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(
+                np.int16
+            )
+        self._place(kind, t, samples)
+
+    def _flush(self, wav_file, transcript_file, upto):
+        for channel in ("learner", "tutor"):
+            if self._cursor[channel] < upto:
+                self._pending[channel].append(
+                    np.zeros(upto - self._cursor[channel], dtype=np.int16)
+                )
+                self._cursor[channel] = upto
+
+        n = upto - self._written
+        if n > 0:
+            stereo = np.empty((n, 2), dtype=np.int16)
+            for column, channel in enumerate(("learner", "tutor")):
+                pending = np.concatenate(self._pending[channel])
+                stereo[:, column] = pending[:n]
+                self._pending[channel] = [pending[n:]]
+            wav_file.writeframes(stereo.tobytes())
+            self._written = upto
+
+        if self._lines:
+            transcript_file.write("\n".join(self._lines) + "\n")
+            transcript_file.flush()
+            self._lines = []
+
+    def _run(self):
+        try:
+            self._write()
+        except Exception as e:
+            self.error = e
+
+    def _write(self):
+        with (
+            wave.open(self.wav_path, "wb") as wav_file,
+            open(self.transcript_path, "w") as transcript_file,
+        ):
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(SAMPLE_WIDTH)
+            wav_file.setframerate(RECEIVE_SAMPLE_RATE)
+
+            last_flush = time.monotonic()
+            stopping = False
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                while item is not None:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    self._handle(*item)
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                now = time.monotonic()
+                if stopping:
+                    self._flush(wav_file, transcript_file, max(self._cursor.values()))
+                elif now - last_flush >= self.flush_interval:
+                    # Leave the last flush interval open so late chunks from
+                    # either channel can still be placed.
+                    upto = int((now - self._started_at - self.flush_interval) * RECEIVE_SAMPLE_RATE)
+                    self._flush(wav_file, transcript_file, max(upto, self._written))
+                    last_flush = now
+
+    def close(self):
+        if self._thread is None:
+            return
+        # Stop must not be dropped, so wait for room while the writer drains;
+        # a writer that already died never will.
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=self.flush_interval)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        self._thread = None
+
+    def report(self):
+        dropped = sum(self.dropped.values())
+        if self.error is not None:
+            return f"recording to {self.wav_path} failed: {self.error} ({dropped} chunks dropped)"
+        return f"recorded to {self.wav_path} ({dropped} chunks dropped)"
 
 
 class AudioLoop:
-    def __init__(self, video_mode=DEFAULT_MODE):
+    def __init__(
+        self,
+        video_mode=DEFAULT_MODE,
+        frame_gate=None,
+        frame_worker=False,
+        voice_gate=None,
+        audio_source=None,
+        audio_sink=None,
+        connect=None,
+        text_input=True,
+        drain_seconds=3.0,
+        tracer=None,
+        recorder=None,
+    ):
         self.video_mode = video_mode
+        self.audio_source = audio_source if audio_source is not None else PyAudioSource()
+        self.audio_sink = audio_sink if audio_sink is not None else PyAudioSink()
+        # Stand-ins for client.aio.live.connect must accept (model=, config=).
+        # The real client is only created when run() needs it.
+        self.connect = connect
+        # Without text input the loop ends once the audio source is exhausted
+        # and ``drain_seconds`` have passed for the reply to play out.
+        self.text_input = text_input
+        self.drain_seconds = drain_seconds
+        self.tracer = tracer if tracer is not None else LatencyTracer()
+        self.recorder = recorder
+        self.voice_gate = voice_gate if voice_gate is not None else VoiceActivityGate()
+        self.frame_gate = frame_gate if frame_gate is not None else FrameGate()
+        self.frame_timings = FrameTimings()
+        self.jpeg_encoder = JpegEncoder()
+        self.frame_worker = frame_worker
 
         self.audio_in_queue = None
         self.out_queue = None
 
         self.session = None
+        self.session_ready = None
+        self.resumption_handle = None
+        self.connect_time = None
+        self.reconnects = 0  # successful resumptions
+        self.reconnect_times = []
 
         self.send_text_task = None
         self.receive_audio_task = None
@@ -83,30 +930,27 @@ class AudioLoop:
             )
             if text.lower() == "q":
                 break
-            await self.session.send(input=text or ".", end_of_turn=True)
+            if self.recorder is not None and text:
+                self.recorder.transcript("learner", text)
+            await self.session_ready.wait()
+            try:
+                await self.session.send(input=text or ".", end_of_turn=True)
+            except Exception as e:
+                if not is_transient_disconnect(e):
+                    raise
+                print("(connection lost, message not sent)")
 
     def _get_frame(self, cap):
-        # Read the frameq
-        ret, frame = cap.read()
-        # Check if the frame was read successfully
-        if not ret:
-            return None
-        # Fix: Convert BGR to RGB color space
-        # OpenCV captures in BGR but PIL expects RGB format
-        # This prevents the blue tint in the video feed
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = PIL.Image.fromarray(frame_rgb)  # Now using RGB frame
-        img.thumbnail([1024, 1024])
-
-        image_io = io.BytesIO()
-        img.save(image_io, format="jpeg")
-        image_io.seek(0)
-
-        mime_type = "image/jpeg"
-        image_bytes = image_io.read()
-        return {"mime_type": mime_type, "data": base64.b64encode(image_bytes).decode()}
+        return capture_frame(
+            lambda: read_camera_image(cap),
+            self.frame_gate,
+            self.frame_timings,
+            self.jpeg_encoder,
+        )
 
     async def get_frames(self):
+        import cv2
+
         # This takes about a second, and will block the whole program
         # causing the audio pipeline to overflow if you don't to_thread it.
         cap = await asyncio.to_thread(
@@ -118,29 +962,18 @@ class AudioLoop:
             if frame is None:
                 break
 
-            await asyncio.sleep(1.0)
+            await asyncio.sleep(self.frame_gate.interval)
 
-            await self.out_queue.put(frame)
+            if frame is not SKIPPED_FRAME:
+                await self.out_queue.put(frame)
 
         # Release the VideoCapture object
         cap.release()
 
     def _get_screen(self):
-        sct = mss.mss()
-        monitor = sct.monitors[0]
-
-        i = sct.grab(monitor)
-
-        mime_type = "image/jpeg"
-        image_bytes = mss.tools.to_png(i.rgb, i.size)
-        img = PIL.Image.open(io.BytesIO(image_bytes))
-
-        image_io = io.BytesIO()
-        img.save(image_io, format="jpeg")
-        image_io.seek(0)
-
-        image_bytes = image_io.read()
-        return {"mime_type": mime_type, "data": base64.b64encode(image_bytes).decode()}
+        return capture_frame(
+            grab_screen_image, self.frame_gate, self.frame_timings, self.jpeg_encoder
+        )
 
     async def get_screen(self):
 
@@ -149,44 +982,93 @@ class AudioLoop:
             if frame is None:
                 break
 
-            await asyncio.sleep(1.0)
+            await asyncio.sleep(self.frame_gate.interval)
+
+            if frame is not SKIPPED_FRAME:
+                await self.out_queue.put(frame)
+
+    async def get_frames_from_worker(self):
+        "Receive frames captured and encoded by a separate process, so the audio threads keep the GIL"
+        ctx = multiprocessing.get_context("spawn")
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        worker = ctx.Process(
+            target=frame_worker,
+            args=(self.video_mode, self.frame_gate, send_conn),
+            daemon=True,
+        )
+        worker.start()
+        send_conn.close()
+
+        try:
+            while True:
+                try:
+                    msg = await asyncio.to_thread(recv_conn.recv)
+                except EOFError:
+                    break
+                if msg is None:
+                    break
+
+                self.frame_gate.interval = msg["interval"]
+                self.frame_gate.sent = msg["sent"]
+                self.frame_gate.skipped = msg["skipped"]
+                self.frame_timings.record(*msg["timing"])
 
-            await self.out_queue.put(frame)
+                if msg["frame"] is not None:
+                    await self.out_queue.put(msg["frame"])
+        finally:
+            worker.terminate()
+            recv_conn.close()
 
     async def send_realtime(self):
         while True:
             msg = await self.out_queue.get()
-            await self.session.send(input=msg)
+            if msg is AUDIO_STREAM_END:
+                await self.session.send_realtime_input(audio_stream_end=True)
+            else:
+                await self.session.send(input=msg)
+            self.tracer.sent(msg)
 
     async def listen_audio(self):
-        mic_info = pya.get_default_input_device_info()
-        self.audio_stream = await asyncio.to_thread(
-            pya.open,
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=SEND_SAMPLE_RATE,
-            input=True,
-            input_device_index=mic_info["index"],
-            frames_per_buffer=CHUNK_SIZE,
-        )
-        if __debug__:
-            kwargs = {"exception_on_overflow": False}
-        else:
-            kwargs = {}
+        await asyncio.to_thread(self.audio_source.open)
         while True:
-            data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, **kwargs)
-            await self.out_queue.put({"data": data, "mime_type": "audio/pcm"})
+            data = await asyncio.to_thread(self.audio_source.read, CHUNK_SIZE)
+            captured_at = time.monotonic()
+            if not data:
+                break
+            if self.recorder is not None:
+                self.recorder.learner_audio(data)
+            chunks = self.voice_gate.process(data)
+            for i, chunk in enumerate(chunks):
+                msg = {"data": chunk, "mime_type": "audio/pcm"}
+                # The current chunk is always the last one released.
+                if i == len(chunks) - 1 and self.voice_gate.in_speech:
+                    self.tracer.speech_chunk(msg, captured_at)
+                await self.out_queue.put(msg)
+                self.tracer.enqueued(msg)
+            if self.voice_gate.stream_paused:
+                # Without this the server keeps waiting for more audio and
+                # never ends the turn.
+                await self.out_queue.put(AUDIO_STREAM_END)
 
     async def receive_audio(self):
         "Background task to reads from the websocket and write pcm chunks to the output queue"
         while True:
             turn = self.session.receive()
             async for response in turn:
+                if update := response.session_resumption_update:
+                    if update.resumable and update.new_handle:
+                        self.resumption_handle = update.new_handle
+                if response.go_away is not None:
+                    raise SessionGoingAway(response.go_away.time_left)
                 if data := response.data:
+                    self.tracer.mark("first_response")
                     self.audio_in_queue.put_nowait(data)
                     continue
                 if text := response.text:
                     print(text, end="")
+                    if self.recorder is not None:
+                        self.recorder.transcript("tutor", text)
+            self.tracer.finish_turn()
 
             # If you interrupt the model, it sends a turn_complete.
             # For interruptions to work, we need to stop playback.
@@ -196,47 +1078,126 @@ class AudioLoop:
                 self.audio_in_queue.get_nowait()
 
     async def play_audio(self):
-        stream = await asyncio.to_thread(
-            pya.open,
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RECEIVE_SAMPLE_RATE,
-            output=True,
-        )
+        await asyncio.to_thread(self.audio_sink.open)
         while True:
             bytestream = await self.audio_in_queue.get()
-            await asyncio.to_thread(stream.write, bytestream)
+            self.tracer.mark("first_write")
+            if self.recorder is not None:
+                self.recorder.tutor_audio(bytestream)
+            await asyncio.to_thread(self.audio_sink.write, bytestream)
+
+    async def wait_for_source_end(self, listen_task):
+        await listen_task
+        await asyncio.sleep(self.drain_seconds)
+
+    async def maintain_session(self, connect):
+        "Keep the live session open, resuming it after transient disconnects"
+        failures = 0
+        disconnected_at = None
+        started = time.monotonic()
+        while True:
+            connected_at = None
+            stable = False
+            try:
+                config = get_config(self.resumption_handle)
+                async with connect(model=MODEL, config=config) as session:
+                    connected_at = time.monotonic()
+                    if disconnected_at is None:
+                        self.connect_time = connected_at - started
+                    else:
+                        self.reconnect_times.append(connected_at - disconnected_at)
+                        self.reconnects += 1
+                        disconnected_at = None
+                    self.session = session
+                    self.session_ready.set()
+
+                    async with asyncio.TaskGroup() as tg:
+                        tg.create_task(self.send_realtime())
+                        tg.create_task(self.receive_audio())
+            except Exception as e:
+                # Only a session that stayed up for a while counts as a
+                # success; one that is closed right after setup (e.g. 1011
+                # resource exhausted) must not reset the failure count.
+                stable = (
+                    connected_at is not None
+                    and time.monotonic() - connected_at >= SESSION_STABLE_SECONDS
+                )
+                if stable:
+                    failures = 0
+                if not is_transient_disconnect(e) or failures >= MAX_RECONNECTS:
+                    raise
+
+            self.session_ready.clear()
+            self.session = None
+            if disconnected_at is None:
+                disconnected_at = time.monotonic()
+            failures += 1
+            print(f"\n(connection lost, reconnect attempt {failures}/{MAX_RECONNECTS})")
+            # Resume a stable session straight away; otherwise back off.
+            if not stable:
+                await asyncio.sleep(
+                    min(RECONNECT_BACKOFF * 2 ** (failures - 1), RECONNECT_BACKOFF_MAX)
+                )
+
+    def connection_report(self):
+        if self.connect_time is None:
+            return "session never connected"
+        report = f"connect: {self.connect_time * 1000:.0f} ms, reconnects: {self.reconnects}"
+        if self.reconnect_times:
+            avg_ms = sum(self.reconnect_times) / len(self.reconnect_times) * 1000
+            report += (
+                f" (avg {avg_ms:.0f} ms, max {max(self.reconnect_times) * 1000:.0f} ms)"
+            )
+        return report
 
     async def run(self):
+        connect = self.connect or get_client().aio.live.connect
+        if self.recorder is not None:
+            self.recorder.start()
         try:
-            async with (
-                client.aio.live.connect(model=MODEL, config=CONFIG) as session,
-                asyncio.TaskGroup() as tg,
-            ):
-                self.session = session
-
+            # The session is opened concurrently with the mic, speaker and
+            # camera, so device start-up and the connect handshake overlap.
+            async with asyncio.TaskGroup() as tg:
                 self.audio_in_queue = asyncio.Queue()
                 self.out_queue = asyncio.Queue(maxsize=5)
+                self.session_ready = asyncio.Event()
 
-                send_text_task = tg.create_task(self.send_text())
-                tg.create_task(self.send_realtime())
-                tg.create_task(self.listen_audio())
-                if self.video_mode == "camera":
+                tg.create_task(self.maintain_session(connect))
+                listen_task = tg.create_task(self.listen_audio())
+                if self.text_input:
+                    exit_task = tg.create_task(self.send_text())
+                else:
+                    exit_task = tg.create_task(self.wait_for_source_end(listen_task))
+                if self.video_mode != "none" and self.frame_worker:
+                    tg.create_task(self.get_frames_from_worker())
+                elif self.video_mode == "camera":
                     tg.create_task(self.get_frames())
                 elif self.video_mode == "screen":
                     tg.create_task(self.get_screen())
 
-                tg.create_task(self.receive_audio())
                 tg.create_task(self.play_audio())
 
-                await send_text_task
+                await exit_task
                 raise asyncio.CancelledError("User requested exit")
 
         except asyncio.CancelledError:
             pass
         except ExceptionGroup as EG:
-            self.audio_stream.close()
             traceback.print_exception(EG)
+        finally:
+            self.audio_source.close()
+            self.audio_sink.close()
+            self.tracer.close()
+            if self.recorder is not None:
+                self.recorder.close()
+                print(self.recorder.report())
+            print(f"\n{self.connection_report()}")
+            print(self.voice_gate.report())
+            if self.tracer.turns:
+                print(self.tracer.report())
+            if self.video_mode != "none":
+                print(self.frame_gate.report())
+                print(self.frame_timings.report())
 
 
 if __name__ == "__main__":
@@ -248,6 +1209,85 @@ if __name__ == "__main__":
         help="pixels to stream from",
         choices=["camera", "screen", "none"],
     )
+    parser.add_argument(
+        "--frame-threshold",
+        type=float,
+        default=FRAME_DIFF_THRESHOLD,
+        help="minimum mean pixel difference (0-1) for a frame to be sent; 0 sends every frame at the fixed 1 fps rate",
+    )
+    parser.add_argument(
+        "--frame-worker",
+        action="store_true",
+        help="capture and encode frames in a separate process",
+    )
+    parser.add_argument(
+        "--vad-threshold",
+        type=float,
+        default=VAD_ENERGY_THRESHOLD,
+        help="RMS level (int16 scale) above which a mic chunk counts as speech",
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="stream every mic chunk, including silence",
+    )
+    parser.add_argument(
+        "--input-wav",
+        type=str,
+        default=None,
+        help="replay this 16 kHz mono WAV instead of the microphone (disables text input)",
+    )
+    parser.add_argument(
+        "--input-speed",
+        type=float,
+        default=1.0,
+        help="replay speed for --input-wav (0 sends as fast as possible)",
+    )
+    parser.add_argument(
+        "--output-wav",
+        type=str,
+        default=None,
+        help="write model audio to this WAV file instead of the speaker",
+    )
+    parser.add_argument(
+        "--no-playback",
+        action="store_true",
+        help="discard model audio instead of playing it",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="append per-turn latency traces to this JSON-lines file",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        help="save the session (stereo WAV + JSONL transcript) into this directory",
+    )
     args = parser.parse_args()
-    main = AudioLoop(video_mode=args.mode)
+    if args.input_wav:
+        audio_source = WavFileSource(args.input_wav, speed=args.input_speed)
+    else:
+        audio_source = PyAudioSource()
+    if args.output_wav:
+        audio_sink = WavFileSink(args.output_wav)
+    elif args.no_playback:
+        audio_sink = NullSink()
+    else:
+        audio_sink = PyAudioSink()
+    main = AudioLoop(
+        video_mode=args.mode,
+        frame_gate=FrameGate(threshold=args.frame_threshold),
+        frame_worker=args.frame_worker,
+        voice_gate=VoiceActivityGate(
+            energy_threshold=args.vad_threshold, enabled=not args.no_vad
+        ),
+        audio_source=audio_source,
+        audio_sink=audio_sink,
+        text_input=args.input_wav is None,
+        tracer=LatencyTracer(args.trace),
+        recorder=SessionRecorder(args.record) if args.record else None,
+    )
     asyncio.run(main.run())
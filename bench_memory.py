@@ -0,0 +1,293 @@
+"""
+오디오 빌드 메모리 회귀 검사 스크립트
+
+API 키 없이 로컬 Live 세션 대역(loadtest_live.local_live_connect)으로
+story / shadowing / roleplay 빌드와 공용 파이프라인(tts_pipeline)을 실행하면서
+단계별로 다음을 측정합니다.
+
+- 최대 메모리: tracemalloc 기준, 단계 시작 대비
+- 최대 RSS: 별도 스레드에서 샘플링 (Linux /proc 필요, 없으면 생략)
+- 남은 할당 블록 수: 단계가 끝난 뒤 남아 있는 블록 (누수 확인)
+
+예산은 "고정분 + 오디오 길이 비례분"이므로 오디오가 길어져도 선형으로만
+늘어납니다. 응답 길이를 바꿔 가며(--seconds) 실행해 응답 전체를 메모리에
+모으거나 바이트를 반복해서 이어 붙이는 회귀를 잡습니다.
+예산을 넘으면 상위 할당 위치를 --snapshot-dir에 저장하고 종료 코드 1로 끝납니다.
+
+## 사용법
+python bench_memory.py
+python bench_memory.py --seconds 1 4 16 --snapshot-dir memory_snapshots
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+import types
+from pathlib import Path
+
+import generate_roleplay_audio
+import generate_shadowing_audio
+import generate_tts_audio
+import tts_pipeline
+from loadtest_live import local_live_connect
+
+PCM_BYTES_PER_SECOND = tts_pipeline.RECEIVE_SAMPLE_RATE * tts_pipeline.SAMPLE_WIDTH
+
+# 단계별 예산: (고정분 KB, 기준 오디오 PCM 크기 대비 비율, 남은 블록 수)
+# 기준 오디오 길이: 합성 단계는 응답 하나, 공백 단계는 공백, 합치기 단계는 전체 출력
+# 받는 대로 파일에 쓰는 단계는 오디오 길이와 거의 무관해야 하므로 비율이 작음.
+# 공용 파이프라인은 재시도를 위해 세그먼트 하나와 공백을 메모리에 둡니다.
+STAGE_BUDGETS = {
+    "story.generate": (256, 0.25, 500),
+    "shadowing.synthesize": (256, 0.25, 500),
+    "shadowing.silence": (256, 1.5, 100),
+    "shadowing.combine": (256, 0.25, 100),
+    "roleplay.synthesize": (256, 0.25, 500),
+    "roleplay.silence": (256, 1.5, 100),
+    "roleplay.combine": (256, 0.25, 100),
+    "pipeline.render": (512, 3.0, 500),
+}
+RSS_FIXED_MB = 32
+RSS_SAMPLE_INTERVAL = 0.002  # 초
+
+WARMUP_SECONDS = 0.2  # 첫 import / 캐시를 측정에서 빼기 위한 예열 실행
+TRACE_FRAMES = 10
+TOP_ALLOCATIONS = 15
+
+
+def read_rss():
+    """현재 RSS (바이트). /proc가 없으면 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+class StageMonitor:
+    """단계 하나의 최대 메모리 / RSS / 남은 블록 수를 예산과 비교
+
+    샘플링 스레드가 예산 초과를 처음 본 순간의 스냅샷을 남기므로,
+    단계 중간에만 잠깐 커졌다 사라지는 할당도 위치를 알 수 있습니다.
+    """
+
+    def __init__(self, name: str, audio_seconds: float):
+        fixed_kb, ratio, blocks = STAGE_BUDGETS[name]
+        self.name = name
+        self.audio_seconds = audio_seconds
+        self.budget = int(fixed_kb * 1024 + ratio * audio_seconds * PCM_BYTES_PER_SECOND)
+        self.rss_budget = RSS_FIXED_MB * 2**20 + 2 * self.budget
+        self.blocks_budget = blocks
+        self.peak = 0
+        self.peak_rss = None
+        self.blocks = 0
+        self.snapshot = None
+        self.snapshot_at_peak = False
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current - self._baseline > self.budget and self.snapshot is None:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.snapshot_at_peak = True
+            rss = read_rss()
+            if rss is not None and self._baseline_rss is not None:
+                self.peak_rss = max(self.peak_rss or 0, rss - self._baseline_rss)
+
+    def __enter__(self):
+        gc.collect()
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._blocks_before = sys.getallocatedblocks()
+        self._baseline_rss = read_rss()
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        _, peak = tracemalloc.get_traced_memory()
+        self._stop.set()
+        self._sampler.join()
+        self.peak = peak - self._baseline
+        if self.over_budget and self.snapshot is None:
+            self.snapshot = tracemalloc.take_snapshot()
+        gc.collect()
+        self.blocks = sys.getallocatedblocks() - self._blocks_before
+        if self.blocks > self.blocks_budget and self.snapshot is None:
+            self.snapshot = tracemalloc.take_snapshot()
+
+    @property
+    def over_budget(self) -> bool:
+        return self.peak > self.budget or (self.peak_rss or 0) > self.rss_budget
+
+    @property
+    def failed(self) -> bool:
+        return self.over_budget or self.blocks > self.blocks_budget
+
+    def save_snapshot(self, directory: Path) -> Path:
+        """단계 시작 이후 늘어난 상위 할당 위치를 텍스트로, 전체 스냅샷을 tracemalloc 파일로 저장"""
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = directory / f"{self.name}-{self.audio_seconds:g}s"
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        snapshot = self.snapshot.filter_traces(ignore)
+        start = self._start_snapshot.filter_traces(ignore)
+        snapshot.dump(str(stem) + ".tracemalloc")
+
+        lines = [f"{self.name} ({self.audio_seconds:g}초 분량) 단계 중 늘어난 상위 할당 위치"]
+        if not self.snapshot_at_peak:
+            # C 함수 한 번 안에서 생겼다 사라진 할당은 샘플링 스레드가 볼 수 없음
+            lines.append("(최대치 시점을 놓쳐 단계 끝 기준으로 저장됨)")
+        lines.append("")
+        for stat in snapshot.compare_to(start, "lineno")[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        lines += ["", "상위 3개 호출 경로", ""]
+        for stat in snapshot.compare_to(start, "traceback")[:3]:
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+}개 블록")
+            lines += stat.traceback.format()
+            lines.append("")
+        path = Path(str(stem) + ".txt")
+        path.write_text("\n".join(lines), encoding="utf-8")
+        return path
+
+
+def install_fake_live(seconds: float):
+    """생성 스크립트들의 get_client()를 로컬 Live 세션 대역으로 교체"""
+    connect = local_live_connect(response_delay=0, response_seconds=seconds)
+    client = types.SimpleNamespace(aio=types.SimpleNamespace(live=types.SimpleNamespace(connect=connect)))
+    for module in (generate_tts_audio, generate_shadowing_audio, generate_roleplay_audio):
+        module.get_client = lambda: client
+    return connect
+
+
+def require(ok: bool, what: str):
+    if not ok:
+        raise RuntimeError(f"{what} 실패")
+
+
+async def story_build(tmp: Path, seconds: float, connect, stage):
+    with stage("story.generate", seconds):
+        ok = await generate_tts_audio.generate_audio(generate_tts_audio.DAY5_STORY_TEXT, str(tmp / "story.mp3"))
+    require(ok, "story")
+
+
+async def shadowing_build(tmp: Path, seconds: float, connect, stage):
+    script = generate_shadowing_audio
+    sentences = script.SHADOWING_SENTENCES
+    wav_files = [str(tmp / f"sentence_{i:02d}.wav") for i in range(1, len(sentences) + 1)]
+
+    with stage("shadowing.synthesize", seconds):
+        for sentence, wav_path in zip(sentences, wav_files):
+            require(await script.generate_single_sentence(sentence, wav_path), "shadowing 문장")
+
+    silence_path = str(tmp / "silence.wav")
+    with stage("shadowing.silence", script.SILENCE_DURATION):
+        script.create_silence_wav(script.SILENCE_DURATION, silence_path)
+
+    total = len(sentences) * seconds + (len(sentences) - 1) * script.SILENCE_DURATION
+    with stage("shadowing.combine", total):
+        script.combine_wav_files(wav_files, silence_path, str(tmp / "shadowing.wav"))
+
+
+async def roleplay_build(tmp: Path, seconds: float, connect, stage):
+    script = generate_roleplay_audio
+    lines = script.ROLEPLAY_LINES
+    wav_files = [str(tmp / f"line_{i:02d}.wav") for i in range(1, len(lines) + 1)]
+
+    with stage("roleplay.synthesize", seconds):
+        for (speaker, line), wav_path in zip(lines, wav_files):
+            require(await script.generate_line(speaker, line, wav_path), "roleplay 대사")
+
+    silence_path = str(tmp / "silence.wav")
+    with stage("roleplay.silence", script.SILENCE_DURATION):
+        script.create_silence_wav(script.SILENCE_DURATION, silence_path)
+
+    total = len(lines) * seconds + (len(lines) - 1) * script.SILENCE_DURATION
+    with stage("roleplay.combine", total):
+        script.combine_wav_files(wav_files, silence_path, str(tmp / "roleplay.wav"))
+
+
+async def pipeline_build(tmp: Path, seconds: float, connect, stage):
+    """synthesis_daemon / generate_bulk_audio가 쓰는 공용 파이프라인"""
+    sentences = generate_shadowing_audio.SHADOWING_SENTENCES
+    job = {"type": "shadowing", "lines": sentences}
+    gap = tts_pipeline.GAPS["shadowing"]
+    pool = tts_pipeline.SessionPool(connect=connect)
+
+    with stage("pipeline.render", seconds):
+        await tts_pipeline.render_output(pool, tts_pipeline.job_segments(job), str(tmp / "pipeline.wav"), gap)
+    await pool.close()
+
+
+BUILDS = [story_build, shadowing_build, roleplay_build, pipeline_build]
+
+
+async def run_builds(seconds: float, stage) -> None:
+    connect = install_fake_live(seconds)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 생성 스크립트의 진행 출력은 숨김
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for build in BUILDS:
+                await build(Path(tmp), seconds, connect, stage)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, nargs="+", default=[1.0, 4.0, 16.0], help="세그먼트 하나의 응답 오디오 길이 (초)")
+    parser.add_argument("--snapshot-dir", default="memory_snapshots", help="예산 초과 시 스냅샷 저장 위치")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧠 오디오 빌드 메모리 검사")
+    print("=" * 60)
+
+    tracemalloc.start(TRACE_FRAMES)
+    asyncio.run(run_builds(WARMUP_SECONDS, lambda name, seconds: contextlib.nullcontext()))
+
+    results = []
+
+    def stage(name: str, audio_seconds: float) -> StageMonitor:
+        monitor = StageMonitor(name, audio_seconds)
+        results.append(monitor)
+        return monitor
+
+    for seconds in args.seconds:
+        asyncio.run(run_builds(seconds, stage))
+    tracemalloc.stop()
+
+    failed = False
+    for monitor in results:
+        status = "❌" if monitor.failed else "✅"
+        rss = "" if monitor.peak_rss is None else (
+            f", RSS {monitor.peak_rss / 2**20:.1f}/{monitor.rss_budget / 2**20:.0f} MB"
+        )
+        print(
+            f"  {status} {monitor.name:<22} {monitor.audio_seconds:>6.1f}초: "
+            f"최대 {monitor.peak / 1024:,.0f}/{monitor.budget / 1024:,.0f} KB{rss}, "
+            f"블록 {monitor.blocks}/{monitor.blocks_budget}"
+        )
+        if monitor.failed and monitor.snapshot is not None:
+            print(f"     📸 {monitor.save_snapshot(Path(args.snapshot_dir))}")
+        failed = failed or monitor.failed
+
+    print("=" * 60)
+    if failed:
+        print("❌ 메모리 예산 초과")
+        sys.exit(1)
+    print("✅ 통과")
+
+
+if __name__ == "__main__":
+    main()
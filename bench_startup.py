@@ -0,0 +1,86 @@
+"""
+시작 시간 회귀 검사 스크립트
+
+`python -X importtime`으로 각 스크립트의 import 시간을 측정하고,
+무거운 모듈(cv2, PIL, mss, pyaudio, google.genai)이 import 시점에
+로드되지 않는지 확인합니다. 예산을 넘거나 금지 모듈이 로드되면
+종료 코드 1로 끝납니다.
+
+## 사용법
+python bench_startup.py
+python bench_startup.py --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# 스크립트별 import 시간 예산 (ms)
+IMPORT_BUDGET_MS = {
+    "ai_studio_code": 300,
+}
+
+# import 시점에 로드되면 안 되는 모듈
+LAZY_MODULES = {
+    "ai_studio_code": ["cv2", "PIL", "mss", "pyaudio", "google.genai"],
+}
+
+
+def measure_import_ms(module: str) -> float:
+    """-X importtime 출력에서 모듈의 누적 import 시간(ms) 추출"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        # 형식: "import time:  self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.removeprefix("import time:").split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"{module} import 시간을 찾지 못했습니다")
+
+
+def loaded_lazy_modules(module: str) -> list:
+    """import 직후 sys.modules에 올라온 금지 모듈 목록"""
+    check = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {LAZY_MODULES[module]!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️ 시작 시간 검사")
+    print("=" * 60)
+
+    failed = False
+    for module, budget in IMPORT_BUDGET_MS.items():
+        median_ms = statistics.median(measure_import_ms(module) for _ in range(args.runs))
+        over_budget = median_ms > budget
+        status = "❌" if over_budget else "✅"
+        print(f"  {status} {module}: {median_ms:.1f} ms (예산 {budget} ms)")
+
+        eager = loaded_lazy_modules(module)
+        if eager:
+            print(f"  ❌ {module}: import 시점에 로드됨 → {', '.join(eager)}")
+
+        failed = failed or over_budget or bool(eager)
+
+    print("=" * 60)
+    if failed:
+        print("❌ 시작 시간 회귀 발견")
+        sys.exit(1)
+    print("✅ 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+정적 사이트 빌드 스크립트
+
+docs/를 배포용 디렉토리로 복사하면서 다음을 수행합니다.
+
+- CSS / JS 압축 (주석, 들여쓰기, 빈 줄 제거)
+- assets/ 아래 파일 이름에 내용 해시 추가 (style.css → style.3f9c2a1b7e.css)
+- 모든 HTML의 src / href / data-src 참조를 해시 이름으로 교체
+- 텍스트 파일(.html, .css, .js, .json)은 .gz / .br 압축본도 함께 저장
+  (.br은 brotli 패키지가 있을 때만)
+- 원래 경로 → 해시 경로 매핑을 assets/manifest.json으로 저장
+- 주 / 일별 오디오 목록을 assets/audio/manifest.json으로 저장하고
+  서비스 워커(sw.js)에 넣음 (main.js의 다음 날 오디오 미리 받기, 오프라인 캐시용)
+
+해시 이름은 내용이 바뀔 때만 바뀌므로 assets/는 브라우저에 오래 캐시해도
+되고, 오디오를 다시 생성하면 새 이름으로 바로 반영됩니다.
+docs/ 원본은 건드리지 않습니다.
+
+## 사용법
+python build_site.py
+python build_site.py --output _site
+python build_site.py --no-minify
+
+## 선택 패키지
+pip install brotli
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+DEFAULT_SOURCE = "docs"
+DEFAULT_OUTPUT = "_site"
+
+# 해시 이름을 붙일 디렉토리 (사이트 루트 기준)
+ASSET_DIR = "assets"
+HASH_LENGTH = 10
+
+# 압축본을 만들 텍스트 파일
+COMPRESSIBLE = {".html", ".css", ".js", ".json"}
+
+# 오디오 파일 이름 형식: week1_day4_shadowing.mp3
+AUDIO_NAME = re.compile(r"assets/audio/week(\d+)_day(\d+)_[^/]+\.mp3$")
+
+# 서비스 워커에서 build가 교체하는 줄
+SERVICE_WORKER = "sw.js"
+SW_MANIFEST_LINE = re.compile(r"^const AUDIO_MANIFEST = .*;$", re.M)
+
+# HTML에서 교체할 참조 (data-src는 지연 로딩 오디오용)
+REFERENCE = re.compile(r'(\b(?:src|href|data-src)=")([^"#?]+)([^"]*")')
+
+
+def minify_css(text: str) -> str:
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    # 선택자의 " :hover" 같은 공백은 의미가 있으므로 ':' 앞은 그대로 둠
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    text = re.sub(r":\s+", ":", text)
+    return text.replace(";}", "}").strip() + "\n"
+
+
+def minify_js(text: str) -> str:
+    """보수적인 JS 압축: 줄바꿈은 유지해 자동 세미콜론 삽입에 영향 없음"""
+    text = re.sub(r"^\s*/\*.*?\*/\s*$", "", text, flags=re.S | re.M)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//")) + "\n"
+
+
+MINIFIERS = {
+    ".css": minify_css,
+    ".js": minify_js,
+}
+
+
+def fingerprint(path: Path, data: bytes) -> Path:
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+def build_assets(source: Path, output: Path, minify: bool) -> dict:
+    """assets/ 아래 파일을 해시 이름으로 저장하고 {원래 경로: 해시 경로} 반환"""
+    manifest = {}
+    for path in sorted((source / ASSET_DIR).rglob("*")):
+        if not path.is_file():
+            continue
+        data = path.read_bytes()
+        if minify and path.suffix in MINIFIERS:
+            data = MINIFIERS[path.suffix](data.decode("utf-8")).encode("utf-8")
+
+        relative = path.relative_to(source)
+        hashed = fingerprint(relative, data)
+        (output / hashed).parent.mkdir(parents=True, exist_ok=True)
+        (output / hashed).write_bytes(data)
+        manifest[relative.as_posix()] = hashed.as_posix()
+    return manifest
+
+
+def rewrite_references(html: str, page: Path, manifest: dict) -> str:
+    """페이지 기준 상대 경로를 해석해 manifest에 있는 참조만 교체"""
+    def replace(match):
+        prefix, url, suffix = match.groups()
+        if "://" in url or url.startswith(("/", "mailto:", "data:")):
+            return match.group(0)
+        target = os.path.normpath(page.parent / url).replace(os.sep, "/")
+        if target not in manifest:
+            return match.group(0)
+        hashed = os.path.relpath(manifest[target], page.parent.as_posix() or ".")
+        return prefix + hashed.replace(os.sep, "/") + suffix
+
+    return REFERENCE.sub(replace, html)
+
+
+def build_pages(source: Path, output: Path, manifest: dict) -> int:
+    """assets/ 밖의 파일을 복사하면서 HTML 참조 교체. 교체한 참조 수 반환"""
+    rewritten = 0
+    for path in sorted(source.rglob("*")):
+        relative = path.relative_to(source)
+        if not path.is_file() or relative.parts[0] == ASSET_DIR:
+            continue
+        (output / relative).parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix != ".html":
+            shutil.copy2(path, output / relative)
+            continue
+        html = path.read_text(encoding="utf-8")
+        new_html = rewrite_references(html, relative, manifest)
+        rewritten += sum(a != b for a, b in zip(REFERENCE.findall(html), REFERENCE.findall(new_html)))
+        (output / relative).write_text(new_html, encoding="utf-8")
+    return rewritten
+
+
+def audio_manifest(manifest: dict) -> dict:
+    """{"version": 해시, "weeks": {"1": {"4": [해시 경로, ...]}}} 형식의 오디오 목록"""
+    weeks = {}
+    for original, hashed in manifest.items():
+        if match := AUDIO_NAME.match(original):
+            week, day = (str(int(n)) for n in match.groups())
+            weeks.setdefault(week, {}).setdefault(day, []).append(hashed)
+    payload = json.dumps(weeks, sort_keys=True)
+    return {"version": hashlib.sha256(payload.encode()).hexdigest()[:HASH_LENGTH], "weeks": weeks}
+
+
+def write_audio_manifest(output: Path, audio: dict):
+    """오디오 목록을 고정 이름 JSON으로 저장하고 서비스 워커에 넣음
+
+    서비스 워커 내용이 바뀌어야 브라우저가 새 버전을 설치하므로
+    목록을 sw.js 안에 직접 넣습니다.
+    """
+    path = output / ASSET_DIR / "audio" / "manifest.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(audio, indent=2) + "\n", encoding="utf-8")
+
+    worker = output / SERVICE_WORKER
+    if worker.exists():
+        line = f"const AUDIO_MANIFEST = {json.dumps(audio, sort_keys=True)};"
+        worker.write_text(
+            SW_MANIFEST_LINE.sub(lambda _: line, worker.read_text(encoding="utf-8"), count=1),
+            encoding="utf-8",
+        )
+
+
+def precompress(output: Path) -> dict:
+    """텍스트 파일마다 .gz (가능하면 .br도) 저장. 형식별 총 바이트 반환"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    sizes = {"original": 0, "gz": 0, "br": 0}
+    for path in sorted(output.rglob("*")):
+        if path.suffix not in COMPRESSIBLE:
+            continue
+        data = path.read_bytes()
+        sizes["original"] += len(data)
+
+        # mtime=0: 내용이 같으면 압축본도 바이트 단위로 같음
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        path.with_name(path.name + ".gz").write_bytes(compressed)
+        sizes["gz"] += len(compressed)
+
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            path.with_name(path.name + ".br").write_bytes(compressed)
+            sizes["br"] += len(compressed)
+    if brotli is None:
+        sizes.pop("br")
+    return sizes
+
+
+def build(source: Path, output: Path, minify: bool = True) -> dict:
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    manifest = build_assets(source, output, minify)
+    rewritten = build_pages(source, output, manifest)
+
+    manifest_path = output / ASSET_DIR / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    audio = audio_manifest(manifest)
+    write_audio_manifest(output, audio)
+
+    return {
+        "assets": len(manifest),
+        "references": rewritten,
+        "audio_weeks": len(audio["weeks"]),
+        "sizes": precompress(output),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="원본 사이트 디렉토리")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="빌드 결과 디렉토리 (매번 새로 만듦)")
+    parser.add_argument("--no-minify", action="store_true", help="CSS / JS 압축 끄기")
+    args = parser.parse_args()
+
+    source, output = Path(args.source), Path(args.output)
+    if source.resolve() == output.resolve():
+        parser.error("--output은 --source와 달라야 합니다")
+
+    print("=" * 60)
+    print("🏗️ 정적 사이트 빌드")
+    print("=" * 60)
+
+    stats = build(source, output, minify=not args.no_minify)
+    sizes = stats["sizes"]
+
+    print(f"🔖 해시 이름 자산: {stats['assets']}개")
+    print(f"🔗 교체한 참조: {stats['references']}개")
+    print(f"🎧 오디오 목록: {stats['audio_weeks']}주 (assets/audio/manifest.json, {SERVICE_WORKER})")
+    print(f"🗜️ 텍스트 파일: {sizes['original']:,} B → gz {sizes['gz']:,} B", end="")
+    print(f", br {sizes['br']:,} B" if "br" in sizes else " (br 생략: pip install brotli)")
+    print("=" * 60)
+    print(f"✅ 완료: {output}/")
+
+
+if __name__ == "__main__":
+    main()
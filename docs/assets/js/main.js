@@ -45,6 +45,129 @@ function initAudioPlayer() {
   });
 }
 
+// ============================================
+// Lazy Audio Loading
+// ============================================
+// Site root, taken from this script's own URL (assets/js/main.js)
+const SITE_ROOT = document.currentScript
+  ? new URL('../../', document.currentScript.src)
+  : new URL('./', location.href);
+
+function attachAudio(audio) {
+  const sources = audio.querySelectorAll('source[data-src]');
+  if (!sources.length) return;
+
+  sources.forEach(source => {
+    source.src = source.dataset.src;
+    source.removeAttribute('data-src');
+  });
+  audio.preload = 'metadata';
+  audio.load();
+}
+
+function initLazyAudio() {
+  const lazyAudios = [...document.querySelectorAll('audio')]
+    .filter(audio => audio.querySelector('source[data-src]'));
+  if (!lazyAudios.length) return;
+
+  // Lesson <audio> elements have no controls and are display:none, so they
+  // never intersect: watch the visible player card around them instead.
+  const cards = new Map();
+  lazyAudios.forEach(audio => {
+    const card = audio.closest('.glass-card') || audio.parentElement;
+    if (!cards.has(card)) cards.set(card, []);
+    cards.get(card).push(audio);
+
+    // Attach on first play intent, before the page's own play() handler runs
+    ['pointerdown', 'click'].forEach(type => {
+      card.addEventListener(type, () => attachAudio(audio), { capture: true });
+    });
+  });
+
+  if (!('IntersectionObserver' in window)) {
+    lazyAudios.forEach(attachAudio);
+    return;
+  }
+
+  const observer = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+      if (!entry.isIntersecting) return;
+      cards.get(entry.target).forEach(attachAudio);
+      observer.unobserve(entry.target);
+    });
+  }, { rootMargin: '300px 0px' });
+
+  cards.forEach((_, card) => observer.observe(card));
+}
+
+// ============================================
+// Next Day Audio Prefetch & Offline Cache
+// ============================================
+// Audio manifest written by build_site.py: { weeks: { "1": { "4": [urls] } } }
+function currentLesson() {
+  const match = location.pathname.match(/week-(\d+)\/(?:day-(\d+)\.html)?/);
+  return match ? { week: Number(match[1]), day: Number(match[2] || 0) } : null;
+}
+
+async function loadAudioManifest() {
+  try {
+    const response = await fetch(new URL('assets/audio/manifest.json', SITE_ROOT), { cache: 'no-cache' });
+    return response.ok ? await response.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+function nextDayAudio(manifest, lesson) {
+  const week = manifest.weeks[lesson.week] || {};
+  const laterDays = Object.keys(week).map(Number).filter(day => day > lesson.day).sort((a, b) => a - b);
+  if (laterDays.length) return week[laterDays[0]];
+
+  const nextWeek = manifest.weeks[lesson.week + 1] || {};
+  const firstDay = Object.keys(nextWeek).map(Number).sort((a, b) => a - b)[0];
+  return firstDay === undefined ? [] : nextWeek[firstDay];
+}
+
+function whenIdle(callback) {
+  if ('requestIdleCallback' in window) {
+    requestIdleCallback(callback, { timeout: 5000 });
+  } else {
+    setTimeout(callback, 2000);
+  }
+}
+
+function initAudioPrefetch() {
+  const lesson = currentLesson();
+  if (!lesson || navigator.connection?.saveData) return;
+
+  whenIdle(async () => {
+    const manifest = await loadAudioManifest();
+    if (!manifest) return;
+
+    nextDayAudio(manifest, lesson).forEach(url => {
+      const link = document.createElement('link');
+      link.rel = 'prefetch';
+      link.as = 'audio';
+      link.href = new URL(url, SITE_ROOT).href;
+      document.head.appendChild(link);
+    });
+  });
+}
+
+function initOfflineAudio() {
+  const lesson = currentLesson();
+  if (!lesson || !('serviceWorker' in navigator)) return;
+
+  navigator.serviceWorker.register(new URL('sw.js', SITE_ROOT))
+    .then(() => navigator.serviceWorker.ready)
+    .then(registration => {
+      registration.active.postMessage({ type: 'cache-week', week: lesson.week });
+    })
+    .catch(() => {
+      // Unbuilt docs/ or unsupported host: audio still streams normally
+    });
+}
+
 // ============================================
 // Vocabulary Flashcards
 // ============================================
@@ -175,6 +298,9 @@ function initReadingProgress() {
 document.addEventListener('DOMContentLoaded', () => {
   initMobileNav();
   initAudioPlayer();
+  initLazyAudio();
+  initAudioPrefetch();
+  initOfflineAudio();
   initFlashcards();
   initQuiz();
   initFillBlanks();
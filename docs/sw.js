@@ -0,0 +1,91 @@
+/**
+ * The Second Self - Service Worker
+ * 지금 학습 중인 주의 오디오를 미리 캐시해 오프라인에서도 재생
+ *
+ * build_site.py가 아래 AUDIO_MANIFEST 줄을 실제 오디오 목록으로 바꿉니다.
+ * (docs/ 원본 그대로는 아무것도 캐시하지 않음)
+ */
+
+const AUDIO_MANIFEST = { version: 'dev', weeks: {} };
+
+const CACHE_PREFIX = 'audio-week-';
+
+// ============================================
+// Week Audio Precache
+// ============================================
+function weekAudioUrls(week) {
+  const days = AUDIO_MANIFEST.weeks[week] || {};
+  return Object.values(days).flat().map(url => new URL(url, self.registration.scope).href);
+}
+
+async function cacheWeek(week) {
+  const urls = weekAudioUrls(week);
+  if (!urls.length) return;
+
+  const cache = await caches.open(CACHE_PREFIX + week);
+  const cached = await cache.keys();
+  const missing = urls.filter(url => !cached.some(request => request.url === url));
+  await cache.addAll(missing);
+
+  // Regenerated audio has a new fingerprinted name: drop the old copies
+  await Promise.all(
+    cached.filter(request => !urls.includes(request.url)).map(request => cache.delete(request))
+  );
+
+  // Evict earlier weeks
+  const names = await caches.keys();
+  await Promise.all(
+    names
+      .filter(name => name.startsWith(CACHE_PREFIX) && Number(name.slice(CACHE_PREFIX.length)) < week)
+      .map(name => caches.delete(name))
+  );
+}
+
+self.addEventListener('install', () => self.skipWaiting());
+
+self.addEventListener('activate', event => {
+  event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('message', event => {
+  if (event.data?.type === 'cache-week') {
+    event.waitUntil(cacheWeek(Number(event.data.week)));
+  }
+});
+
+// ============================================
+// Cache-First Audio (with Range support for <audio> seeking)
+// ============================================
+async function rangeResponse(request, response) {
+  const range = request.headers.get('range');
+  const match = range && range.match(/bytes=(\d*)-(\d*)/);
+  if (!match) return response;
+
+  const blob = await response.blob();
+  const start = match[1] ? Number(match[1]) : Math.max(blob.size - Number(match[2]), 0);
+  const end = match[1] && match[2] ? Math.min(Number(match[2]), blob.size - 1) : blob.size - 1;
+
+  return new Response(blob.slice(start, end + 1), {
+    status: 206,
+    statusText: 'Partial Content',
+    headers: {
+      'Content-Type': response.headers.get('Content-Type') || 'audio/mpeg',
+      'Content-Length': String(end - start + 1),
+      'Content-Range': `bytes ${start}-${end}/${blob.size}`,
+      'Accept-Ranges': 'bytes',
+    },
+  });
+}
+
+self.addEventListener('fetch', event => {
+  const { request } = event;
+  if (request.method !== 'GET' || !request.url.includes('/assets/audio/') || !request.url.endsWith('.mp3')) {
+    return;
+  }
+
+  event.respondWith(
+    caches.match(request.url).then(cached =>
+      cached ? rangeResponse(request, cached) : fetch(request)
+    )
+  );
+});
@@ -0,0 +1,180 @@
+"""
+JSONL 일괄 오디오 생성 스크립트
+
+한 줄에 하나씩 세그먼트(또는 출력 파일 하나)를 적은 JSONL 작업 파일을
+스트리밍으로 읽어 오디오를 만듭니다. 파일을 한꺼번에 읽지 않으므로
+작업 파일이 아무리 커도 메모리 사용량은 일정합니다.
+결과는 출력 파일마다 한 줄씩 JSONL로 기록됩니다.
+
+## 사용법
+python generate_bulk_audio.py requests.jsonl
+python generate_bulk_audio.py jobs.jsonl --results results.jsonl --concurrency 3
+other_tool | python generate_bulk_audio.py -
+
+## 작업 줄 형식
+{"type": "shadowing", "text": "I am married.", "output": "docs/assets/audio/week1_day4_shadowing.mp3"}
+{"type": "roleplay", "speaker": "B", "text": "I'm a teacher.", "output": "...", "gap": 3.0}
+{"type": "story", "text": "...", "voice": "Zephyr", "output": "..."}
+
+- 같은 "output"이 연속된 줄들은 한 파일의 세그먼트로 합쳐집니다
+  (세그먼트 사이 공백은 첫 줄의 "gap", 없으면 유형별 기본값).
+- 이미 만든 "output"이 뒤에 다시 나오면 (다른 줄이 끼어든 경우) 덮어쓰지 않고
+  오류로 기록합니다. 한 파일의 줄들은 연속으로 적어야 합니다.
+  (만드는 중인 파일 목록과 파일 수정 시각으로 확인하므로 출력 파일 수와
+  관계없이 메모리는 일정합니다)
+- "lines"가 있는 줄은 그 자체로 출력 파일 하나입니다 (synthesis_daemon 작업 형식).
+
+## 결과 줄 형식
+{"line": 1, "output": "...", "status": "ok", "segments": 10, "duration": 45.2,
+ "synth_seconds": 30.1, "encode_seconds": 1.2, "seconds": 31.5}
+
+## 환경 변수
+export GEMINI_API_KEY="your_api_key"
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+import tts_pipeline
+
+DEFAULT_CONCURRENCY = 2
+
+
+def read_records(stream):
+    """(줄 번호, 작업 dict 또는 예외) 를 한 줄씩 생성"""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"작업 줄은 JSON 객체여야 합니다: {line.strip()[:40]}")
+            if "type" not in record or "output" not in record:
+                raise ValueError('"type"과 "output"이 필요합니다')
+            yield number, record
+        except ValueError as e:
+            yield number, e
+
+
+def group_outputs(records):
+    """연속된 같은 출력 파일의 줄들을 (첫 줄 번호, 출력, 줄 목록)으로 묶음
+
+    잘못된 줄은 (줄 번호, None, 예외)로 따로 나옵니다.
+    한 번에 한 출력 파일 분량의 줄만 메모리에 둡니다.
+    """
+    def key(item):
+        number, record = item
+        return ("error", number) if isinstance(record, Exception) else ("output", record["output"])
+
+    for (kind, value), group in itertools.groupby(records, key=key):
+        group = list(group)
+        if kind == "error":
+            yield group[0][0], None, group[0][1]
+        else:
+            yield group[0][0], value, [record for _, record in group]
+
+
+def written_since(output: str, since: float) -> bool:
+    """since(time.time()) 이후에 쓰인 출력 파일인지 (mp3 변환 실패로 남은 WAV 포함)"""
+    paths = [output, output[:-4] + ".wav"] if output.endswith(".mp3") else [output]
+    for path in paths:
+        try:
+            if os.stat(path).st_mtime >= since:
+                return True
+        except FileNotFoundError:
+            pass
+    return False
+
+
+async def render_group(pool, number: int, output: str, records: list) -> dict:
+    started = time.monotonic()
+    first = records[0]
+    segments = (segment for record in records for segment in tts_pipeline.job_segments(record))
+    result = await tts_pipeline.render_output(
+        pool, segments, output, first.get("gap", tts_pipeline.GAPS[first["type"]])
+    )
+    return {
+        "line": number,
+        "status": "ok",
+        **result,
+        "seconds": round(time.monotonic() - started, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("jobs", help="JSONL 작업 파일 (- 는 표준 입력)")
+    parser.add_argument("--results", default="results.jsonl", help="결과 JSONL 파일")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 만들 출력 파일 수")
+    args = parser.parse_args()
+
+    jobs = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+    pool = tts_pipeline.SessionPool()
+    slots = asyncio.Semaphore(args.concurrency)
+    counts = {"ok": 0, "error": 0}
+    run_started = time.time()
+    in_progress = set()  # 만드는 중인 출력 파일 (절대 경로, 최대 --concurrency개)
+
+    print("=" * 60)
+    print("📦 JSONL 일괄 오디오 생성")
+    print("=" * 60)
+    print(f"📝 작업: {args.jobs} → 결과: {args.results}")
+    print(f"⚙️ 동시 출력 파일: {args.concurrency}개")
+    print("=" * 60)
+
+    with jobs, open(args.results, "a", encoding="utf-8") as results:
+        def record_result(result: dict):
+            results.write(json.dumps(result, ensure_ascii=False) + "\n")
+            results.flush()
+            counts[result["status"]] += 1
+            if result["status"] == "ok":
+                print(f"  ✅ {result['line']}행: {result['output']} ({result['duration']}초)")
+            else:
+                print(f"  ❌ {result['line']}행: {result['error']}")
+
+        async def run(number: int, output: str, records: list):
+            try:
+                result = await render_group(pool, number, output, records)
+            except Exception as e:
+                result = {"line": number, "output": output, "status": "error",
+                          "error": f"{type(e).__name__}: {e}"}
+            finally:
+                in_progress.discard(os.path.abspath(output))
+                slots.release()
+            record_result(result)
+
+        groups = group_outputs(read_records(jobs))
+        async with asyncio.TaskGroup() as tg:
+            # 표준 입력이 느리게 들어와도 진행 중인 합성이 멈추지 않도록 스레드에서 읽음
+            while (group := await asyncio.to_thread(next, groups, None)) is not None:
+                number, output, records = group
+                if output is None:
+                    record_result({"line": number, "status": "error", "error": str(records)})
+                    continue
+                # 빈 슬롯이 날 때까지 다음 줄을 읽지 않음 → 메모리 일정
+                await slots.acquire()
+                path = os.path.abspath(output)
+                if path in in_progress or written_since(output, run_started):
+                    # 같은 파일을 두 작업이 동시에 쓰면 내용이 덮어써지거나 깨짐
+                    slots.release()
+                    record_result({"line": number, "output": output, "status": "error",
+                                   "error": "앞에서 이미 만든 출력 파일입니다 (같은 output의 줄은 연속으로 적어야 합니다)"})
+                    continue
+                in_progress.add(path)
+                tg.create_task(run(number, output, records))
+
+    await pool.close()
+
+    print("\n" + "=" * 60)
+    print(f"✅ 성공 {counts['ok']}개, ❌ 실패 {counts['error']}개")
+    print(f"📁 결과: {args.results}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,10 +12,10 @@ pip install google-genai pydub
 
 import os
 import asyncio
+import functools
 import wave
 import subprocess
 from pathlib import Path
-import struct
 
 from google import genai
 from google.genai import types
@@ -29,11 +29,13 @@ SILENCE_DURATION = 4.0  # 문장 사이 공백 (초)
 # 모델 설정
 MODEL = "models/gemini-2.5-flash-native-audio-preview-12-2025"
 
-# API 클라이언트
-client = genai.Client(
-    http_options={"api_version": "v1beta"},
-    api_key=os.environ.get("GEMINI_API_KEY"),
-)
+# API 클라이언트 (실제로 생성이 필요할 때 처음 만들어짐)
+@functools.cache
+def get_client():
+    return genai.Client(
+        http_options={"api_version": "v1beta"},
+        api_key=os.environ.get("GEMINI_API_KEY"),
+    )
 
 # Live API 설정
 CONFIG = types.LiveConnectConfig(
@@ -64,31 +66,30 @@ async def generate_single_sentence(text: str, output_path: str) -> bool:
     """단일 문장을 오디오로 변환하여 WAV 저장"""
     print(f"  🎤 생성 중: {text[:30]}...")
     
-    audio_chunks = []
-    
     try:
-        async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-            await session.send(
-                input=f"Read this sentence naturally in a warm, conversational tone: {text}",
-                end_of_turn=True
-            )
-            
-            turn = session.receive()
-            async for response in turn:
-                if data := response.data:
-                    audio_chunks.append(data)
-        
-        if not audio_chunks:
-            print(f"    ❌ 오디오 데이터 없음")
-            return False
-        
-        # PCM 데이터 결합 및 WAV 저장
-        pcm_data = b"".join(audio_chunks)
+        # 받는 즉시 WAV에 기록 (응답 전체를 메모리에 모으지 않음)
         with wave.open(output_path, "wb") as wav_file:
             wav_file.setnchannels(CHANNELS)
             wav_file.setsampwidth(SAMPLE_WIDTH)
             wav_file.setframerate(RECEIVE_SAMPLE_RATE)
-            wav_file.writeframes(pcm_data)
+
+            async with get_client().aio.live.connect(model=MODEL, config=CONFIG) as session:
+                await session.send(
+                    input=f"Read this sentence naturally in a warm, conversational tone: {text}",
+                    end_of_turn=True
+                )
+
+                turn = session.receive()
+                async for response in turn:
+                    if data := response.data:
+                        wav_file.writeframes(data)
+
+            received = wav_file.tell()
+
+        if not received:
+            os.remove(output_path)
+            print(f"    ❌ 오디오 데이터 없음")
+            return False
         
         return True
     except Exception as e:
@@ -99,7 +100,7 @@ async def generate_single_sentence(text: str, output_path: str) -> bool:
 def create_silence_wav(duration: float, output_path: str):
     """지정된 길이의 무음 WAV 파일 생성"""
     num_samples = int(RECEIVE_SAMPLE_RATE * duration)
-    silence_data = struct.pack('<' + 'h' * num_samples, *([0] * num_samples))
+    silence_data = bytes(num_samples * SAMPLE_WIDTH)
     
     with wave.open(output_path, "wb") as wav_file:
         wav_file.setnchannels(CHANNELS)
@@ -108,28 +109,30 @@ def create_silence_wav(duration: float, output_path: str):
         wav_file.writeframes(silence_data)
 
 
+def copy_frames(wav_path: str, output_wav, block_frames: int = RECEIVE_SAMPLE_RATE):
+    """WAV 파일의 프레임을 열린 출력 WAV에 블록 단위로 복사"""
+    with wave.open(wav_path, "rb") as wav_file:
+        while frames := wav_file.readframes(block_frames):
+            output_wav.writeframes(frames)
+
+
 def combine_wav_files(wav_files: list, silence_path: str, output_path: str):
     """WAV 파일들을 공백과 함께 합치기"""
     print(f"\n📦 오디오 파일 합치는 중...")
     
-    combined_data = b""
-    
-    for i, wav_path in enumerate(wav_files):
-        # 문장 오디오 추가
-        with wave.open(wav_path, "rb") as wav_file:
-            combined_data += wav_file.readframes(wav_file.getnframes())
-        
-        # 마지막 문장이 아니면 공백 추가
-        if i < len(wav_files) - 1:
-            with wave.open(silence_path, "rb") as silence_file:
-                combined_data += silence_file.readframes(silence_file.getnframes())
-    
-    # 합친 WAV 저장
+    # 합친 데이터를 메모리에 모으지 않고 블록 단위로 바로 이어 씀
     with wave.open(output_path, "wb") as output_wav:
         output_wav.setnchannels(CHANNELS)
         output_wav.setsampwidth(SAMPLE_WIDTH)
         output_wav.setframerate(RECEIVE_SAMPLE_RATE)
-        output_wav.writeframes(combined_data)
+
+        for i, wav_path in enumerate(wav_files):
+            # 문장 오디오 추가
+            copy_frames(wav_path, output_wav)
+
+            # 마지막 문장이 아니면 공백 추가
+            if i < len(wav_files) - 1:
+                copy_frames(silence_path, output_wav)
     
     print(f"  ✅ WAV 저장 완료: {output_path}")
 
@@ -15,6 +15,7 @@ export GEMINI_API_KEY="your_api_key"
 
 import os
 import asyncio
+import functools
 import wave
 import subprocess
 from pathlib import Path
@@ -30,11 +31,13 @@ SAMPLE_WIDTH = 2  # 16-bit audio = 2 bytes
 # 모델 설정
 MODEL = "models/gemini-2.5-flash-native-audio-preview-12-2025"
 
-# API 클라이언트
-client = genai.Client(
-    http_options={"api_version": "v1beta"},
-    api_key=os.environ.get("GEMINI_API_KEY"),
-)
+# API 클라이언트 (실제로 생성이 필요할 때 처음 만들어짐)
+@functools.cache
+def get_client():
+    return genai.Client(
+        http_options={"api_version": "v1beta"},
+        api_key=os.environ.get("GEMINI_API_KEY"),
+    )
 
 # Live API 설정
 CONFIG = types.LiveConnectConfig(
@@ -91,37 +94,34 @@ async def generate_audio(text: str, output_path: str):
     """텍스트를 오디오로 변환하여 저장"""
     print(f"🎤 오디오 생성 중: {output_path}")
     
-    audio_chunks = []
-    
-    async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-        # 텍스트 전송 - 자연스러운 대화 톤으로
-        await session.send(
-            input=f"Read this text naturally in a warm, conversational tone. Speak as if you're a friendly American man casually introducing himself to a new friend. Use natural rhythm, linking between words, and authentic emotion: {text}",
-            end_of_turn=True
-        )
-        
-        # 오디오 응답 수신
-        turn = session.receive()
-        async for response in turn:
-            if data := response.data:
-                audio_chunks.append(data)
-            if text := response.text:
-                print(f"  (텍스트 응답: {text[:50]}...)" if len(text) > 50 else f"  (텍스트 응답: {text})")
-    
-    if not audio_chunks:
-        print("❌ 오디오 데이터를 받지 못했습니다.")
-        return False
-    
-    # PCM 데이터 결합
-    pcm_data = b"".join(audio_chunks)
-    
-    # WAV 파일로 저장
+    # 받는 즉시 WAV에 기록 (응답 전체를 메모리에 모으지 않음)
     wav_path = output_path.replace(".mp3", ".wav")
     with wave.open(wav_path, "wb") as wav_file:
         wav_file.setnchannels(CHANNELS)
         wav_file.setsampwidth(SAMPLE_WIDTH)
         wav_file.setframerate(RECEIVE_SAMPLE_RATE)
-        wav_file.writeframes(pcm_data)
+
+        async with get_client().aio.live.connect(model=MODEL, config=CONFIG) as session:
+            # 텍스트 전송 - 자연스러운 대화 톤으로
+            await session.send(
+                input=f"Read this text naturally in a warm, conversational tone. Speak as if you're a friendly American man casually introducing himself to a new friend. Use natural rhythm, linking between words, and authentic emotion: {text}",
+                end_of_turn=True
+            )
+
+            # 오디오 응답 수신
+            turn = session.receive()
+            async for response in turn:
+                if data := response.data:
+                    wav_file.writeframes(data)
+                if text := response.text:
+                    print(f"  (텍스트 응답: {text[:50]}...)" if len(text) > 50 else f"  (텍스트 응답: {text})")
+
+        received = wav_file.tell()
+
+    if not received:
+        os.remove(wav_path)
+        print("❌ 오디오 데이터를 받지 못했습니다.")
+        return False
     
     print(f"  ✅ WAV 저장 완료: {wav_path}")
     
@@ -0,0 +1,244 @@
+"""
+AudioLoop 오프라인 부하 테스트 스크립트
+
+사운드 카드나 API 키 없이 AudioLoop를 여러 세션 동시에 실행합니다.
+마이크 대신 녹음된 WAV 파일을 재생하고, 스피커 대신 NullSink로 출력 시각만
+기록하며, Live API 대신 로컬 스텁 세션이 응답합니다.
+
+## 사용법
+python loadtest_live.py --wav learner.wav --sessions 20 --speed 2.0
+
+입력 WAV는 16 kHz / mono / 16-bit 이어야 합니다.
+
+## 측정 항목
+- 발화 종료 → 첫 응답 오디오 출력까지의 지연 (세션별, 전체 p50/p95)
+- 전송 큐(out_queue) 최대 길이
+- 재연결 횟수/시간 (--disconnect-after 로 연결 끊김 흉내)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+import types
+
+import numpy as np
+
+from ai_studio_code import (
+    CHUNK_SIZE,
+    RECEIVE_SAMPLE_RATE,
+    AudioLoop,
+    NullSink,
+    VoiceActivityGate,
+    WavFileSource,
+    percentile,
+)
+
+# 스텁 세션 설정
+RESPONSE_DELAY = 0.3  # 서버 처리 지연 흉내 (초)
+RESPONSE_SECONDS = 2.0  # 응답 오디오 길이 (초)
+RESPONSE_CHUNK_SECONDS = 0.04
+
+
+class LocalLiveSession:
+    """client.aio.live.connect 세션의 로컬 대역
+
+    발화가 담긴 오디오 뒤에 audio_stream_end를 받거나 end_of_turn 텍스트를 받으면
+    ``response_delay`` 후 사인파 응답 오디오를 한 턴으로 돌려줍니다.
+    턴마다 세션 재개 핸들을 보내고, ``disconnect_after`` 초가 지나면
+    연결이 끊긴 것처럼 ConnectionResetError를 냅니다.
+    """
+
+    def __init__(
+        self,
+        response_delay=RESPONSE_DELAY,
+        response_seconds=RESPONSE_SECONDS,
+        disconnect_after=None,
+    ):
+        self.response_delay = response_delay
+        self.disconnect_after = disconnect_after
+        self._opened_at = time.monotonic()
+        self._turn_count = 0
+        self._announced = False
+        self._vad = VoiceActivityGate(hangover_chunks=0, preroll_chunks=0)
+        self._turns = asyncio.Queue()
+        self._in_speech = False
+
+        self._response_samples = int(RECEIVE_SAMPLE_RATE * response_seconds)
+
+    async def send(self, input=None, end_of_turn=False):
+        if isinstance(input, dict) and input.get("mime_type") == "audio/pcm":
+            if self._vad.is_speech(input["data"]):
+                self._in_speech = True
+        elif end_of_turn:
+            self._end_turn()
+
+    async def send_realtime_input(self, audio_stream_end=False):
+        # 무음만 보내다 멈춘 경우는 턴으로 치지 않음
+        if audio_stream_end and self._in_speech:
+            self._end_turn()
+
+    def _end_turn(self):
+        self._in_speech = False
+        self._turns.put_nowait(time.monotonic())
+
+    def _check_connection(self):
+        if (
+            self.disconnect_after is not None
+            and time.monotonic() - self._opened_at >= self.disconnect_after
+        ):
+            raise ConnectionResetError("stub session disconnected")
+
+    async def receive(self):
+        if self._turn_count == 0 and not self._announced:
+            # 실제 서버처럼 연결 직후 첫 재개 핸들을 보냄
+            self._announced = True
+            yield self._handle_update()
+
+        if self.disconnect_after is None:
+            await self._turns.get()
+        else:
+            remaining = self.disconnect_after - (time.monotonic() - self._opened_at)
+            try:
+                await asyncio.wait_for(self._turns.get(), max(remaining, 0))
+            except TimeoutError:
+                self._check_connection()
+        await asyncio.sleep(self.response_delay)
+        for chunk in self._response_chunks():
+            self._check_connection()
+            yield message(data=chunk)
+            await asyncio.sleep(0)
+
+        self._turn_count += 1
+        yield self._handle_update()
+
+    def _response_chunks(self):
+        """사인파 응답을 청크마다 만들어 냄 (응답 전체를 메모리에 두지 않음)"""
+        step = int(RECEIVE_SAMPLE_RATE * RESPONSE_CHUNK_SECONDS)
+        for start in range(0, self._response_samples, step):
+            t = np.arange(start, min(start + step, self._response_samples)) / RECEIVE_SAMPLE_RATE
+            yield (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16).tobytes()
+
+    def _handle_update(self):
+        return message(
+            session_resumption_update=types.SimpleNamespace(
+                resumable=True, new_handle=f"stub-{self._turn_count}"
+            )
+        )
+
+
+def message(data=None, text=None, session_resumption_update=None):
+    """LiveServerMessage 모양의 스텁 응답"""
+    return types.SimpleNamespace(
+        data=data,
+        text=text,
+        session_resumption_update=session_resumption_update,
+        go_away=None,
+    )
+
+
+def local_live_connect(disconnect_after=None, **session_kwargs):
+    """``AudioLoop(connect=...)``에 넘길 connect 대역 생성
+
+    ``disconnect_after``는 새 세션에만 적용되고, 재개 핸들로 다시 연결한
+    세션은 끊기지 않습니다.
+    """
+
+    @contextlib.asynccontextmanager
+    async def connect(model=None, config=None):
+        resumption = getattr(config, "session_resumption", None)
+        resumed = resumption is not None and resumption.handle is not None
+        yield LocalLiveSession(
+            disconnect_after=None if resumed else disconnect_after, **session_kwargs
+        )
+
+    return connect
+
+
+async def run_session(index: int, wav_path: str, speed: float, connect) -> dict:
+    """세션 하나를 실행하고 지연/큐 통계 반환"""
+    source = WavFileSource(wav_path, speed=speed)
+    sink = NullSink()
+    loop = AudioLoop(
+        video_mode="none",
+        audio_source=source,
+        audio_sink=sink,
+        connect=connect,
+        text_input=False,
+    )
+
+    max_queue = 0
+
+    async def sample_queue():
+        nonlocal max_queue
+        while True:
+            if loop.out_queue is not None:
+                max_queue = max(max_queue, loop.out_queue.qsize())
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample_queue())
+    try:
+        await loop.run()
+    finally:
+        sampler.cancel()
+
+    latency = None
+    if source.speech_end_at is not None:
+        first_audio = sink.first_write_after(source.speech_end_at)
+        if first_audio is not None:
+            latency = first_audio - source.speech_end_at
+
+    return {
+        "session": index,
+        "latency": latency,
+        "max_queue": max_queue,
+        "reconnects": loop.reconnects,
+        "reconnect_times": loop.reconnect_times,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", required=True, help="16 kHz mono 16-bit 학습자 발화 WAV")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 속도 (0 = 최대 속도)")
+    parser.add_argument("--response-delay", type=float, default=RESPONSE_DELAY, help="스텁 서버 지연 (초)")
+    parser.add_argument("--disconnect-after", type=float, default=None, help="새 세션을 N초 후 끊기 (재연결 측정)")
+    args = parser.parse_args()
+
+    connect = local_live_connect(
+        response_delay=args.response_delay, disconnect_after=args.disconnect_after
+    )
+
+    print("=" * 60)
+    print("🧪 AudioLoop 오프라인 부하 테스트")
+    print("=" * 60)
+    print(f"📝 세션 수: {args.sessions}, 재생 속도: {args.speed}x")
+    print(f"🎤 입력: {args.wav} ({CHUNK_SIZE} 샘플 청크)")
+    print("=" * 60)
+
+    results = await asyncio.gather(
+        *(run_session(i, args.wav, args.speed, connect) for i in range(args.sessions))
+    )
+
+    latencies = [r["latency"] for r in results if r["latency"] is not None]
+    for r in results:
+        latency = f"{r['latency'] * 1000:.0f} ms" if r["latency"] is not None else "응답 없음"
+        print(f"  세션 {r['session']:3d}: 지연 {latency}, 최대 큐 {r['max_queue']}, 재연결 {r['reconnects']}회")
+
+    print("\n" + "=" * 60)
+    if latencies:
+        print(f"⏱️ 발화 종료 → 첫 오디오: p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 95) * 1000:.0f} ms, "
+              f"평균 {statistics.mean(latencies) * 1000:.0f} ms")
+    reconnect_times = [t for r in results for t in r["reconnect_times"]]
+    if reconnect_times:
+        print(f"🔌 재연결: {len(reconnect_times)}회, p50 {percentile(reconnect_times, 50) * 1000:.0f} ms, "
+              f"최대 {max(reconnect_times) * 1000:.0f} ms")
+    print(f"✅ 응답 받은 세션: {len(latencies)}/{len(results)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,218 @@
+"""
+로컬 오디오 합성 데몬
+
+음성별 Live 세션을 미리 열어 두고, 로컬 포트로 들어오는 합성 작업을
+우선순위 큐로 처리합니다. 스크립트를 매번 새로 실행할 때 드는
+Python 시작, SDK import, 클라이언트 생성, 첫 연결 비용을 한 번만 냅니다.
+
+## 사용법
+# 데몬 실행 (한 번만)
+export GEMINI_API_KEY="your_api_key"
+python synthesis_daemon.py serve
+
+# 작업 제출 (진행 상황과 결과 파일 경로가 스트리밍됨)
+python synthesis_daemon.py submit --type story --text-file story.txt --output docs/assets/audio/week3_day2_story.mp3
+python synthesis_daemon.py submit --type shadowing --lines-file sentences.txt --output docs/assets/audio/week3_day4_shadowing.mp3
+python synthesis_daemon.py submit --job roleplay_job.json --priority 0
+
+## 프로토콜
+127.0.0.1 TCP, 줄 단위 JSON.
+요청: {"job": {...}}  (작업 형식은 tts_pipeline.job_segments 참고)
+응답: queued → progress (세그먼트마다) → done 또는 error
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+import tts_pipeline
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CONCURRENCY = 2
+DEFAULT_PRIORITY = 10  # 낮을수록 먼저 처리
+
+
+class SynthesisDaemon:
+    """우선순위 큐 + 워커 + 음성별 세션 풀"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, pool=None):
+        self.concurrency = concurrency
+        self.pool = pool if pool is not None else tts_pipeline.SessionPool()
+        self.queue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+
+    async def submit(self, job: dict, report) -> None:
+        """작업을 큐에 넣음. ``report(event)``로 진행 상황을 알림"""
+        tts_pipeline.job_segments(job)  # 형식 오류는 큐에 넣기 전에 알림
+        priority = job.get("priority", DEFAULT_PRIORITY)
+        await self.queue.put((priority, next(self._seq), job, report))
+        report({"event": "queued", "position": self.queue.qsize()})
+
+    async def worker(self):
+        while True:
+            _, _, job, report = await self.queue.get()
+            try:
+                await self.run_job(job, report)
+            except Exception as e:
+                report({"event": "error", "message": f"{type(e).__name__}: {e}"})
+            finally:
+                self.queue.task_done()
+
+    async def run_job(self, job: dict, report) -> None:
+        started = time.monotonic()
+        segments = tts_pipeline.job_segments(job)
+        result = await tts_pipeline.render_output(
+            self.pool,
+            segments,
+            job["output"],
+            job.get("gap", tts_pipeline.GAPS[job["type"]]),
+            on_segment=lambda i, voice: report(
+                {"event": "progress", "done": i, "total": len(segments), "voice": voice}
+            ),
+        )
+        report({
+            "event": "done",
+            "output": result["output"],
+            "duration": result["duration"],
+            "seconds": round(time.monotonic() - started, 2),
+        })
+
+    async def handle_client(self, reader, writer):
+        events = asyncio.Queue()
+        try:
+            request = json.loads(await reader.readline())
+            await self.submit(request["job"], events.put_nowait)
+        except Exception as e:
+            events.put_nowait({"event": "error", "message": f"잘못된 요청: {e}"})
+
+        try:
+            while True:
+                event = await events.get()
+                writer.write((json.dumps(event, ensure_ascii=False) + "\n").encode())
+                await writer.drain()
+                if event["event"] in ("done", "error"):
+                    break
+        except ConnectionError:
+            pass  # 클라이언트가 먼저 끊어도 작업은 계속 진행
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int, voices: list):
+        print("=" * 60)
+        print("🎛️ 오디오 합성 데몬")
+        print("=" * 60)
+
+        started = time.monotonic()
+        await self.pool.prewarm(voices)
+        print(f"🔥 세션 예열 완료: {', '.join(voices)} ({time.monotonic() - started:.1f}초)")
+
+        workers = [asyncio.create_task(self.worker()) for _ in range(self.concurrency)]
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"📡 대기 중: {host}:{port} (동시 작업 {self.concurrency}개)")
+        print("=" * 60)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in workers:
+                task.cancel()
+            await self.pool.close()
+
+
+async def submit_job(host: str, port: int, job: dict) -> bool:
+    """데몬에 작업을 보내고 진행 상황 출력. 성공 여부 반환"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps({"job": job}, ensure_ascii=False) + "\n").encode())
+    await writer.drain()
+
+    ok = False
+    while line := await reader.readline():
+        event = json.loads(line)
+        if event["event"] == "queued":
+            print(f"📥 대기열 {event['position']}번째")
+        elif event["event"] == "progress":
+            print(f"  🎤 {event['done']}/{event['total']} ({event['voice']})")
+        elif event["event"] == "done":
+            print(f"✅ 완료: {event['output']} ({event['duration']}초 분량, {event['seconds']}초 소요)")
+            ok = True
+        else:
+            print(f"❌ 실패: {event['message']}")
+    writer.close()
+    return ok
+
+
+def read_lines(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def build_job(args) -> dict:
+    if args.job:
+        with open(args.job, encoding="utf-8") as f:
+            job = json.load(f)
+    else:
+        job = {"type": args.type, "output": args.output}
+        if args.type == "story":
+            with open(args.text_file, encoding="utf-8") as f:
+                job["text"] = f.read()
+        elif args.type == "shadowing":
+            job["lines"] = read_lines(args.lines_file)
+        else:
+            # roleplay 대사 파일: 한 줄에 "A: 대사" 형식
+            job["lines"] = [line.split(":", 1) for line in read_lines(args.lines_file)]
+            job["lines"] = [[speaker.strip(), text.strip()] for speaker, text in job["lines"]]
+    if args.voice:
+        job["voice"] = args.voice
+    if args.gap is not None:
+        job["gap"] = args.gap
+    if args.priority is not None:
+        job["priority"] = args.priority
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="데몬 실행")
+    serve.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 처리할 작업 수")
+    serve.add_argument("--voices", nargs="+", default=["Zephyr", "Puck", "Kore"], help="미리 열어 둘 음성")
+    serve.add_argument("--max-session-turns", type=int, default=tts_pipeline.MAX_SESSION_TURNS, help="세션 하나로 처리할 최대 턴 수")
+
+    submit = commands.add_parser("submit", help="작업 제출")
+    submit.add_argument("--job", help="작업 JSON 파일")
+    submit.add_argument("--type", choices=sorted(tts_pipeline.PROMPTS), help="작업 유형")
+    submit.add_argument("--text-file", help="story 본문 파일")
+    submit.add_argument("--lines-file", help="shadowing 문장 / roleplay 대사 파일 (한 줄에 하나)")
+    submit.add_argument("--output", help="결과 파일 경로 (.mp3 또는 .wav)")
+    submit.add_argument("--voice", help="음성 이름 (story/shadowing)")
+    submit.add_argument("--gap", type=float, help="세그먼트 사이 공백 (초)")
+    submit.add_argument("--priority", type=int, help=f"우선순위 (낮을수록 먼저, 기본 {DEFAULT_PRIORITY})")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        daemon = SynthesisDaemon(
+            concurrency=args.concurrency,
+            pool=tts_pipeline.SessionPool(max_turns=args.max_session_turns),
+        )
+        try:
+            asyncio.run(daemon.serve(args.host, args.port, args.voices))
+        except KeyboardInterrupt:
+            print("\n👋 데몬 종료")
+        return
+
+    if not args.job and not (args.type and args.output):
+        parser.error("submit에는 --job 또는 --type과 --output이 필요합니다")
+    ok = asyncio.run(submit_job(args.host, args.port, build_job(args)))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+오디오 생성 공용 파이프라인
+
+synthesis_daemon.py 등에서 함께 쓰는 합성 / WAV / MP3 함수 모음입니다.
+음성, 프롬프트, 공백 길이는 설정/audio_generation_spec.md 명세를 따릅니다.
+
+google-genai는 실제로 연결할 때 처음 import 합니다.
+"""
+
+import os
+import asyncio
+import collections
+import contextlib
+import functools
+import subprocess
+import time
+import wave
+
+# 오디오 설정
+RECEIVE_SAMPLE_RATE = 24000
+CHANNELS = 1
+SAMPLE_WIDTH = 2  # 16-bit audio = 2 bytes
+
+# 모델 설정
+MODEL = "models/gemini-2.5-flash-native-audio-preview-12-2025"
+
+# 유형별 기본 음성 / 프롬프트 / 세그먼트 사이 공백 (초)
+VOICES = {
+    "story": "Zephyr",
+    "shadowing": "Zephyr",
+    "roleplay": {"A": "Puck", "B": "Kore"},
+}
+
+PROMPTS = {
+    "story": "Read this text naturally in a warm, conversational tone. Speak as if you're a friendly American man casually introducing himself to a new friend. Use natural rhythm, linking between words, and authentic emotion: {text}",
+    "shadowing": "Read this sentence naturally in a warm, conversational tone: {text}",
+    "roleplay": "Read this line naturally in a friendly conversational tone: {text}",
+}
+
+GAPS = {
+    "story": 0.0,
+    "shadowing": 4.0,
+    "roleplay": 3.0,
+}
+
+# 세션 하나로 처리할 최대 턴 수 (대화 맥락이 쌓이지 않도록 주기적으로 새로 연결)
+MAX_SESSION_TURNS = 10
+
+
+# API 클라이언트 (실제로 생성이 필요할 때 처음 만들어짐)
+@functools.cache
+def get_client():
+    from google import genai
+
+    return genai.Client(
+        http_options={"api_version": "v1beta"},
+        api_key=os.environ.get("GEMINI_API_KEY"),
+    )
+
+
+@functools.cache
+def live_config(voice: str):
+    """음성별 Live API 설정"""
+    from google.genai import types
+
+    return types.LiveConnectConfig(
+        response_modalities=["AUDIO"],
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice)
+            )
+        ),
+    )
+
+
+def job_segments(job: dict) -> list:
+    """작업을 (음성, 프롬프트) 세그먼트 목록으로 변환
+
+    - story:     {"text": "..."}
+    - shadowing: {"lines": ["...", ...]}
+    - roleplay:  {"lines": [["A", "..."], ["B", "..."], ...]}
+    세그먼트 하나만 줄 때는 어느 유형이든 {"text": "..."}를 쓸 수 있습니다
+    (roleplay는 "speaker" 또는 "voice" 필요).
+    "voice"를 주면 기본 음성 대신 사용합니다 (roleplay는 화자별 dict).
+    "prompt"를 주면 기본 프롬프트 대신 사용합니다 ({text} 자리에 문장).
+    """
+    kind = job["type"]
+    if kind not in PROMPTS:
+        raise ValueError(f"알 수 없는 작업 유형: {kind}")
+    prompt = job.get("prompt") or PROMPTS[kind]
+    voice = job.get("voice") or VOICES[kind]
+
+    if "text" in job:
+        if isinstance(voice, dict):
+            voice = voice[job["speaker"]]
+        return [(voice, prompt.format(text=job["text"]))]
+    if kind in ("story", "shadowing"):
+        return [(voice, prompt.format(text=line)) for line in job["lines"]]
+    return [(voice[speaker], prompt.format(text=line)) for speaker, line in job["lines"]]
+
+
+async def synthesize(session, prompt: str) -> list:
+    """열린 세션에 프롬프트를 보내고 한 턴의 PCM 청크 목록 반환"""
+    await session.send(input=prompt, end_of_turn=True)
+
+    chunks = []
+    async for response in session.receive():
+        if data := response.data:
+            chunks.append(data)
+    return chunks
+
+
+async def synthesize_segment(pool, voice: str, prompt: str, attempts: int = 2) -> list:
+    """풀에서 세션을 빌려 합성. 세션 오류 시 새 세션으로 다시 시도"""
+    for attempt in range(1, attempts + 1):
+        try:
+            async with pool.session(voice) as session:
+                return await synthesize(session, prompt)
+        except Exception:
+            if attempt == attempts:
+                raise
+
+
+async def render_output(pool, segments, output: str, gap: float, on_segment=None) -> dict:
+    """세그먼트들을 합성해 하나의 파일로 저장
+
+    ``segments``는 (음성, 프롬프트)의 iterable이며 하나씩 합성해 바로 WAV에
+    씁니다. ``output``이 .mp3이면 WAV를 만든 뒤 변환하고, ffmpeg가 없으면
+    WAV를 남깁니다. ``on_segment(i, voice)``는 세그먼트마다 호출됩니다.
+    """
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    wav_path = output[:-4] + ".wav" if output.endswith(".mp3") else output
+
+    synth_seconds = 0.0
+    writer = SegmentWavWriter(wav_path, gap)
+    try:
+        for i, (voice, prompt) in enumerate(segments, 1):
+            started = time.monotonic()
+            chunks = await synthesize_segment(pool, voice, prompt)
+            synth_seconds += time.monotonic() - started
+            if not chunks:
+                raise RuntimeError(f"세그먼트 {i}: 오디오 데이터 없음")
+            writer.add(chunks)
+            if on_segment is not None:
+                on_segment(i, voice)
+    except BaseException:
+        writer.close()
+        os.remove(wav_path)  # 만들다 만 파일은 남기지 않음
+        raise
+    segment_count = writer.segments
+    duration = writer.duration
+    writer.close()
+
+    encode_seconds = 0.0
+    if wav_path != output:
+        started = time.monotonic()
+        if await asyncio.to_thread(convert_to_mp3, wav_path, output):
+            os.remove(wav_path)
+        else:
+            output = wav_path
+        encode_seconds = time.monotonic() - started
+
+    return {
+        "output": output,
+        "segments": segment_count,
+        "duration": round(duration, 2),
+        "synth_seconds": round(synth_seconds, 2),
+        "encode_seconds": round(encode_seconds, 2),
+    }
+
+
+class _PooledSession:
+    def __init__(self, stack, session):
+        self.stack = stack
+        self.session = session
+        self.turns = 0
+
+
+class SessionPool:
+    """음성별로 열어 둔 Live 세션 풀
+
+    ``session(voice)``로 빌려 쓰고 반납하면 다음 작업이 재사용합니다.
+    사용 중 오류가 나면 그 세션은 닫고, ``max_turns``만큼 쓴 세션도 닫습니다.
+    """
+
+    def __init__(self, max_turns=MAX_SESSION_TURNS, connect=None):
+        self.max_turns = max_turns
+        # connect 대역은 (model=, config=)를 받아야 합니다.
+        self.connect = connect
+        self.opened = 0
+        self._idle = collections.defaultdict(list)
+
+    async def _open(self, voice: str) -> _PooledSession:
+        connect = self.connect or get_client().aio.live.connect
+        stack = contextlib.AsyncExitStack()
+        session = await stack.enter_async_context(
+            connect(model=MODEL, config=live_config(voice))
+        )
+        self.opened += 1
+        return _PooledSession(stack, session)
+
+    async def prewarm(self, voices):
+        """음성마다 세션을 하나씩 미리 열어 둠"""
+        opened = await asyncio.gather(*(self._open(voice) for voice in voices))
+        for voice, entry in zip(voices, opened):
+            self._idle[voice].append(entry)
+
+    @contextlib.asynccontextmanager
+    async def session(self, voice: str):
+        entry = self._idle[voice].pop() if self._idle[voice] else await self._open(voice)
+        try:
+            yield entry.session
+        except BaseException:
+            await entry.stack.aclose()
+            raise
+
+        entry.turns += 1
+        if entry.turns >= self.max_turns:
+            await entry.stack.aclose()
+        else:
+            self._idle[voice].append(entry)
+
+    async def close(self):
+        for entries in self._idle.values():
+            for entry in entries:
+                await entry.stack.aclose()
+        self._idle.clear()
+
+
+class SegmentWavWriter:
+    """세그먼트를 받는 즉시 WAV에 이어 쓰고, 세그먼트 사이에 공백 삽입"""
+
+    def __init__(self, path: str, gap: float = 0.0):
+        self.path = path
+        self.gap_bytes = bytes(int(RECEIVE_SAMPLE_RATE * gap) * SAMPLE_WIDTH)
+        self.segments = 0
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(CHANNELS)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(RECEIVE_SAMPLE_RATE)
+
+    def add(self, chunks: list):
+        if self.segments and self.gap_bytes:
+            self._wav.writeframes(self.gap_bytes)
+        for chunk in chunks:
+            self._wav.writeframes(chunk)
+        self.segments += 1
+
+    @property
+    def duration(self) -> float:
+        return self._wav.getnframes() / RECEIVE_SAMPLE_RATE
+
+    def close(self):
+        self._wav.close()
+
+
+def convert_to_mp3(wav_path: str, mp3_path: str) -> bool:
+    """WAV를 MP3로 변환 (ffmpeg 필요)"""
+    try:
+        subprocess.run([
+            "ffmpeg", "-y", "-i", wav_path,
+            "-codec:a", "libmp3lame", "-qscale:a", "2",
+            mp3_path
+        ], check=True, capture_output=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False